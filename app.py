@@ -1,9 +1,18 @@
 import streamlit as st
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from datetime import datetime
-import re
+import logging
+import time
+
+from audit import DEFAULT_AUDIT_LOG_DIR, open_audit_log, submission_fingerprint
+from circuit_breaker import CLOSED, CircuitBreaker, counts_as_failure, open_smtp, smtp_probe
+from complaints import complaint_options, load_complaint
+from drafts import DEFAULT_DRAFT_DB_PATH, DraftSession, DraftStore, is_valid_token, new_token
+from drug_index import DEFAULT_DRUG_NAMES_FILE, load_drug_index
+from form_render import prepare_form_data
+from validation import IncrementalValidator, compile_rules
+
+logger = logging.getLogger(__name__)
 
 # Page configuration
 st.set_page_config(
@@ -38,328 +47,29 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
+# Form fields saved in drafts (widget keys), plus the FIELDS of the selected complaint module
+DRAFT_FIELDS = (
+    "patient_name", "patient_dob", "presenting_complaint",
+    "hpc_when_started", "hpc_progression", "hpc_severity", "hpc_triggers", "hpc_relieving", "hpc_associated",
+    "fever", "cough_cold", "unwell_contacts", "sob", "calf_pain", "recent_surgery",
+    "travel_history", "haemoptysis", "malignancy_history", "prev_vte", "orthopnea",
+    "abdominal_pain", "vomiting", "loss_consciousness", "dizziness",
+    "pmh", "drug_history", "has_allergies", "drug_allergies", "family_heart_attack", "family_stroke",
+    "family_history_detail", "smoking_status", "alcohol_use", "recreational_drugs",
+    "recreational_drugs_detail", "additional_info", "receiving_email", "patient_email",
+)
+
 # Initialize session state
 if 'form_submitted' not in st.session_state:
     st.session_state.form_submitted = False
 
 # ========== FUNCTION DEFINITIONS ==========
-def prepare_form_data(patient_name, patient_dob, presenting_complaint,
-                     hpc_when_started, hpc_progression, hpc_severity, hpc_triggers, hpc_relieving, hpc_associated,
-                     pain_start_date, pain_start_time, pain_site, pain_onset,
-                     pain_character, pain_radiation, pain_timing, pain_severity,
-                     pain_exacerbating, pain_relieving, other_complaint_detail,
-                     fever, cough_cold, unwell_contacts, sob, calf_pain, recent_surgery,
-                     travel_history, haemoptysis, malignancy_history, prev_vte, orthopnea,
-                     abdominal_pain, vomiting, loss_consciousness, dizziness,
-                     pmh, drug_history, drug_allergies, family_heart_attack, family_stroke,
-                     family_history_detail, smoking_status, alcohol_use, recreational_drugs,
-                     recreational_drugs_detail, additional_info):
-    """Prepare form data as formatted HTML"""
-    
-    # Prepare boolean values as Yes/No strings
-    fever_str = 'Yes' if fever else 'No'
-    cough_cold_str = 'Yes' if cough_cold else 'No'
-    unwell_contacts_str = 'Yes' if unwell_contacts else 'No'
-    sob_str = 'Yes' if sob else 'No'
-    calf_pain_str = 'Yes' if calf_pain else 'No'
-    recent_surgery_str = 'Yes' if recent_surgery else 'No'
-    travel_history_str = 'Yes' if travel_history else 'No'
-    haemoptysis_str = 'Yes' if haemoptysis else 'No'
-    malignancy_history_str = 'Yes' if malignancy_history else 'No'
-    prev_vte_str = 'Yes' if prev_vte else 'No'
-    orthopnea_str = 'Yes' if orthopnea else 'No'
-    abdominal_pain_str = 'Yes' if abdominal_pain else 'No'
-    vomiting_str = 'Yes' if vomiting else 'No'
-    loss_consciousness_str = 'Yes' if loss_consciousness else 'No'
-    dizziness_str = 'Yes' if dizziness else 'No'
-    family_heart_attack_str = 'Yes' if family_heart_attack else 'No'
-    family_stroke_str = 'Yes' if family_stroke else 'No'
-    
-    # Prepare text fields with defaults
-    pmh_str = pmh if pmh else 'None reported'
-    drug_history_str = drug_history if drug_history else 'None reported'
-    family_history_detail_str = family_history_detail if family_history_detail else 'None reported'
-    additional_info_str = additional_info if additional_info else 'None provided'
-    
-    # Build general HPC section
-    general_hpc_section = f"""
-    <div class="section">
-        <h2>History of Your Complaint</h2>
-        <div class="field">
-            <span class="label">When did it start?</span>
-            <span class="value">{hpc_when_started if hpc_when_started else 'Not specified'}</span>
-        </div>
-        <div class="field">
-            <span class="label">How has it progressed?</span>
-            <span class="value">{hpc_progression if hpc_progression else 'Not specified'}</span>
-        </div>
-        <div class="field">
-            <span class="label">Severity:</span>
-            <span class="value">{hpc_severity if hpc_severity else 'Not specified'}</span>
-        </div>
-        <div class="field">
-            <span class="label">What makes it worse?</span>
-            <span class="value">{hpc_triggers if hpc_triggers else 'Not specified'}</span>
-        </div>
-        <div class="field">
-            <span class="label">What makes it better?</span>
-            <span class="value">{hpc_relieving if hpc_relieving else 'Not specified'}</span>
-        </div>
-        <div class="field">
-            <span class="label">Associated symptoms?</span>
-            <span class="value">{hpc_associated if hpc_associated else 'None reported'}</span>
-        </div>
-    </div>
-    """
-    
-    # Build HPC section based on complaint type
-    if presenting_complaint == "Chest Pain":
-        pain_site_str = ', '.join(pain_site) if pain_site else 'Not specified'
-        pain_character_str = ', '.join(pain_character) if pain_character else 'Not specified'
-        pain_radiation_str = ', '.join(pain_radiation) if pain_radiation else 'No radiation'
-        
-        hpc_section = general_hpc_section + f"""
-        <div class="section">
-            <h2>Additional Chest Pain Details</h2>
-            <div class="field">
-                <span class="label">When did the pain start:</span>
-                <span class="value">{pain_start_date if pain_start_date else 'Not specified'} {f'at {pain_start_time}' if pain_start_time else ''}</span>
-            </div>
-            <div class="field">
-                <span class="label">Site of Pain:</span>
-                <span class="value">{pain_site_str}</span>
-            </div>
-            <div class="field">
-                <span class="label">Onset:</span>
-                <span class="value">{pain_onset if pain_onset else 'Not specified'}</span>
-            </div>
-            <div class="field">
-                <span class="label">Character of Pain:</span>
-                <span class="value">{pain_character_str}</span>
-            </div>
-            <div class="field">
-                <span class="label">Radiation:</span>
-                <span class="value">{pain_radiation_str}</span>
-            </div>
-            <div class="field">
-                <span class="label">Timing:</span>
-                <span class="value">{pain_timing if pain_timing else 'Not specified'}</span>
-            </div>
-            <div class="field">
-                <span class="label">Severity (0-10):</span>
-                <span class="value">{pain_severity}/10</span>
-            </div>
-            <div class="field">
-                <span class="label">Exacerbating Factors:</span>
-                <span class="value">{pain_exacerbating if pain_exacerbating else 'None reported'}</span>
-            </div>
-            <div class="field">
-                <span class="label">Relieving Factors:</span>
-                <span class="value">{pain_relieving if pain_relieving else 'None reported'}</span>
-            </div>
-        </div>
-        """
-    else:
-        other_complaint_detail_str = other_complaint_detail if other_complaint_detail else 'No additional details provided'
-        hpc_section = general_hpc_section + f"""
-        <div class="section">
-            <h2>Additional Details</h2>
-            <div class="field">
-                <span class="value">{other_complaint_detail_str}</span>
-            </div>
-        </div>
-        """
-    
-    # Build recreational drugs detail section
-    recreational_drugs_detail_section = ""
-    if recreational_drugs == "Yes" and recreational_drugs_detail:
-        recreational_drugs_detail_section = f"""
-            <div class="field">
-                <span class="label">Recreational Drug Details:</span>
-                <span class="value">{recreational_drugs_detail}</span>
-            </div>
-        """
-    
-    # Build the complete HTML using f-string
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    html_content = f"""
-    <html>
-    <head>
-        <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .section {{ margin: 20px 0; padding: 15px; border-left: 4px solid #1f77b4; background-color: #f9f9f9; }}
-            .section h2 {{ color: #1f77b4; margin-top: 0; }}
-            .field {{ margin: 10px 0; }}
-            .label {{ font-weight: bold; color: #1f77b4; }}
-            .value {{ margin-left: 10px; }}
-            hr {{ border: none; border-top: 2px solid #1f77b4; margin: 30px 0; }}
-        </style>
-    </head>
-    <body>
-        <h1>Patient Medical History Form</h1>
-        <p>Submitted: {timestamp}</p>
-        <hr>
-        
-        <div class="section">
-            <h2>Basic Information</h2>
-            <div class="field">
-                <span class="label">Name:</span>
-                <span class="value">{patient_name}</span>
-            </div>
-            <div class="field">
-                <span class="label">Date of Birth:</span>
-                <span class="value">{patient_dob}</span>
-            </div>
-        </div>
-        
-        <div class="section">
-            <h2>Chief Complaint</h2>
-            <div class="field">
-                <span class="label">Presenting Complaint:</span>
-                <span class="value">{presenting_complaint}</span>
-            </div>
-        </div>
-        
-        {hpc_section}
-        
-        <div class="section">
-            <h2>Systems Review</h2>
-            <div class="field">
-                <span class="label">Fever:</span>
-                <span class="value">{fever_str}</span>
-            </div>
-            <div class="field">
-                <span class="label">Cough/Cold Symptoms:</span>
-                <span class="value">{cough_cold_str}</span>
-            </div>
-            <div class="field">
-                <span class="label">Unwell Contacts:</span>
-                <span class="value">{unwell_contacts_str}</span>
-            </div>
-            <div class="field">
-                <span class="label">Shortness of Breath:</span>
-                <span class="value">{sob_str}</span>
-            </div>
-            <div class="field">
-                <span class="label">Calf Pain:</span>
-                <span class="value">{calf_pain_str}</span>
-            </div>
-            <div class="field">
-                <span class="label">Recent Surgery:</span>
-                <span class="value">{recent_surgery_str}</span>
-            </div>
-            <div class="field">
-                <span class="label">Recent Travel:</span>
-                <span class="value">{travel_history_str}</span>
-            </div>
-            <div class="field">
-                <span class="label">Haemoptysis (Coughing up blood):</span>
-                <span class="value">{haemoptysis_str}</span>
-            </div>
-            <div class="field">
-                <span class="label">History of Cancer:</span>
-                <span class="value">{malignancy_history_str}</span>
-            </div>
-            <div class="field">
-                <span class="label">Previous Blood Clot (DVT/PE):</span>
-                <span class="value">{prev_vte_str}</span>
-            </div>
-            <div class="field">
-                <span class="label">Difficulty Breathing When Lying Flat:</span>
-                <span class="value">{orthopnea_str}</span>
-            </div>
-            <div class="field">
-                <span class="label">Abdominal Pain:</span>
-                <span class="value">{abdominal_pain_str}</span>
-            </div>
-            <div class="field">
-                <span class="label">Vomiting:</span>
-                <span class="value">{vomiting_str}</span>
-            </div>
-            <div class="field">
-                <span class="label">Loss of Consciousness:</span>
-                <span class="value">{loss_consciousness_str}</span>
-            </div>
-            <div class="field">
-                <span class="label">Dizziness:</span>
-                <span class="value">{dizziness_str}</span>
-            </div>
-        </div>
-        
-        <div class="section">
-            <h2>Past Medical History</h2>
-            <div class="field">
-                <span class="value">{pmh_str}</span>
-            </div>
-        </div>
-        
-        <div class="section">
-            <h2>Current Medications</h2>
-            <div class="field">
-                <span class="value">{drug_history_str}</span>
-            </div>
-        </div>
-        
-        <div class="section">
-            <h2>Drug Allergies</h2>
-            <div class="field">
-                <span class="value">{drug_allergies}</span>
-            </div>
-        </div>
-        
-        <div class="section">
-            <h2>Family History</h2>
-            <div class="field">
-                <span class="label">Family History of Heart Attack:</span>
-                <span class="value">{family_heart_attack_str}</span>
-            </div>
-            <div class="field">
-                <span class="label">Family History of Stroke:</span>
-                <span class="value">{family_stroke_str}</span>
-            </div>
-            <div class="field">
-                <span class="label">Additional Family History:</span>
-                <span class="value">{family_history_detail_str}</span>
-            </div>
-        </div>
-        
-        <div class="section">
-            <h2>Social History</h2>
-            <div class="field">
-                <span class="label">Smoking Status:</span>
-                <span class="value">{smoking_status}</span>
-            </div>
-            <div class="field">
-                <span class="label">Alcohol Use:</span>
-                <span class="value">{alcohol_use}</span>
-            </div>
-            <div class="field">
-                <span class="label">Recreational Drug Use:</span>
-                <span class="value">{recreational_drugs}</span>
-            </div>
-            {recreational_drugs_detail_section}
-        </div>
-        
-        <div class="section">
-            <h2>Additional Information</h2>
-            <div class="field">
-                <span class="value">{additional_info_str}</span>
-            </div>
-        </div>
-        
-        <hr>
-        <p style="font-size: 12px; color: #666; text-align: center;">
-            This form was generated automatically by the Patient History Information Tool.
-        </p>
-    </body>
-    </html>
-    """
-    
-    return html_content
-
-
-def send_email(receiving_email, form_data, patient_email=None):
+def send_email(receiving_email, form_data, patient_email=None, fingerprint=None):
     """Send form data via email"""
+    audit_log = get_audit_log()
+    breaker = None
+    recipient = "clinic"
+    started = time.perf_counter()
     try:
         # Email configuration - Update these with your email settings
         sender_email = st.secrets.get("SENDER_EMAIL", "")
@@ -369,47 +79,158 @@ def send_email(receiving_email, form_data, patient_email=None):
         
         # Check if email configuration is available
         if not sender_email or not sender_password:
+            audit_log.record("failed", fingerprint=fingerprint, recipient=recipient, error="EmailNotConfigured")
             st.error("Email configuration not found. Please set up email credentials in secrets.")
             st.info("To set up email, add SENDER_EMAIL, SENDER_PASSWORD, SMTP_SERVER, and SMTP_PORT to .streamlit/secrets.toml")
             return False
         
+        # Fail fast while the email server is known to be down
+        breaker = get_smtp_breaker()
+        if not breaker.allow():
+            audit_log.record("failed", fingerprint=fingerprint, recipient=recipient, error="CircuitOpen")
+            st.error("The email server is not responding at the moment. Your answers have been saved - please try again in a few minutes.")
+            return False
+        
         # Create message
         message = MIMEMultipart("alternative")
         message["Subject"] = "Patient Medical History Form Submission"
         message["From"] = sender_email
         message["To"] = receiving_email
+        if fingerprint:
+            message["X-Submission-Fingerprint"] = fingerprint
         
         # Attach HTML content
         part = MIMEText(form_data, "html")
         message.attach(part)
         
         # Send email
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
+        with connect_smtp(smtp_server, smtp_port) as server:
             server.starttls()
             server.login(sender_email, sender_password)
             server.sendmail(sender_email, receiving_email, message.as_string())
+        audit_log.record("delivered", fingerprint=fingerprint, recipient=recipient, smtp_code=server.data_reply_code,
+                         duration_ms=round((time.perf_counter() - started) * 1000, 1))
+        # The server accepted a message, so close the breaker even if the patient copy fails
+        breaker.record_success()
         
         # Send copy to patient if requested
         if patient_email and patient_email.strip() != "":
+            recipient = "patient_copy"
+            started = time.perf_counter()
             message_copy = MIMEMultipart("alternative")
             message_copy["Subject"] = "Your Patient Medical History Form - Copy"
             message_copy["From"] = sender_email
             message_copy["To"] = patient_email
+            if fingerprint:
+                message_copy["X-Submission-Fingerprint"] = fingerprint
             
             part_copy = MIMEText(form_data, "html")
             message_copy.attach(part_copy)
             
-            with smtplib.SMTP(smtp_server, smtp_port) as server:
+            with connect_smtp(smtp_server, smtp_port) as server:
                 server.starttls()
                 server.login(sender_email, sender_password)
                 server.sendmail(sender_email, patient_email, message_copy.as_string())
+            audit_log.record("delivered", fingerprint=fingerprint, recipient=recipient, smtp_code=server.data_reply_code,
+                             duration_ms=round((time.perf_counter() - started) * 1000, 1))
+            breaker.record_success()
         
         return True
     
     except Exception as e:
+        if breaker is not None:
+            if counts_as_failure(e):
+                breaker.record_failure()
+            else:
+                breaker.release()
+        # Record only the SMTP code and error type: error messages can contain email addresses
+        audit_log.record("failed", fingerprint=fingerprint, recipient=recipient,
+                         smtp_code=getattr(e, "smtp_code", None), error=type(e).__name__,
+                         duration_ms=round((time.perf_counter() - started) * 1000, 1))
         st.error(f"Error sending email: {str(e)}")
         return False
 
+
+def connect_smtp(smtp_server, smtp_port):
+    """Open an SMTP connection with the configured connect and read timeouts"""
+    return open_smtp(smtp_server, smtp_port,
+                     connect_timeout=float(st.secrets.get("SMTP_CONNECT_TIMEOUT", 10)),
+                     read_timeout=float(st.secrets.get("SMTP_READ_TIMEOUT", 30)))
+
+
+@st.cache_resource
+def get_smtp_breaker():
+    """Create the email circuit breaker and start its health probe once per process"""
+    smtp_server = st.secrets.get("SMTP_SERVER", "smtp.gmail.com")
+    smtp_port = st.secrets.get("SMTP_PORT", 587)
+    connect_timeout = float(st.secrets.get("SMTP_CONNECT_TIMEOUT", 10))
+    audit_log = get_audit_log()
+    
+    breaker = CircuitBreaker(
+        failure_threshold=int(st.secrets.get("SMTP_FAILURE_THRESHOLD", 3)),
+        reset_timeout=float(st.secrets.get("SMTP_RESET_TIMEOUT", 60)),
+        probe=lambda: smtp_probe(smtp_server, smtp_port, connect_timeout),
+        probe_interval=float(st.secrets.get("SMTP_PROBE_INTERVAL", 10)),
+        on_state_change=lambda old, stats: audit_log.record("smtp_circuit", previous_state=old, **stats)
+    )
+    breaker.start_prober()
+    return breaker
+
+
+@st.cache_resource
+def get_audit_log():
+    """Start the audit log writer once per process"""
+    return open_audit_log(st.secrets.get("AUDIT_LOG_DIR", DEFAULT_AUDIT_LOG_DIR))
+
+
+@st.cache_resource
+def get_drug_index():
+    """Build the medication prefix index once per process, shared by all sessions"""
+    path = st.secrets.get("DRUG_NAMES_FILE", DEFAULT_DRUG_NAMES_FILE)
+    index = load_drug_index(path)
+    logger.info("Loaded %d drug names from %s (%.1f KiB)", len(index), path, index.memory_bytes() / 1024)
+    return index
+
+
+def add_medication(field_key):
+    """Append the drug selected in the medication lookup to a form field"""
+    selected = st.session_state.get("medication_lookup_choice")
+    if not selected:
+        return
+    current = st.session_state.get(field_key, "").rstrip(", ")
+    st.session_state[field_key] = f"{current}, {selected}" if current else selected
+    # Show the allergy box (and send its contents) rather than "No known drug allergies"
+    if field_key == "drug_allergies":
+        st.session_state.has_allergies = "Yes"
+
+
+@st.cache_resource
+def get_draft_store():
+    """Open the draft store and start its background writer and expiry sweeper once per process"""
+    store = DraftStore(
+        st.secrets.get("DRAFT_DB_PATH", DEFAULT_DRAFT_DB_PATH),
+        ttl_seconds=float(st.secrets.get("DRAFT_TTL_HOURS", 24)) * 60 * 60
+    )
+    store.start_sweeper()
+    return store
+
+
+def start_draft_session():
+    """Attach this session to its draft token and restore any saved draft"""
+    token = st.experimental_get_query_params().get("draft", [None])[0]
+    if not is_valid_token(token):
+        token = new_token()
+        st.experimental_set_query_params(draft=token)
+
+    draft = DraftSession(get_draft_store(), token)
+    values = draft.restore()
+    complaint = load_complaint(values.get("presenting_complaint"))
+    fields = DRAFT_FIELDS + (complaint.FIELDS if complaint else ())
+    for field, value in values.items():
+        if field in fields:
+            st.session_state[field] = value
+    st.session_state.draft = draft
+
 # ========== END FUNCTION DEFINITIONS ==========
 
 # Header
@@ -417,8 +238,30 @@ st.markdown("<h1 class='main-header'>🏥 Patient Medical History Form</h1>", un
 st.markdown("<p style='text-align: center; color: #666;'>Please complete this form with as much detail as possible. Your information helps us provide better care.</p>", unsafe_allow_html=True)
 st.divider()
 
+# Resume a saved draft (the token is kept in the page URL)
+if 'draft' not in st.session_state:
+    start_draft_session()
+
+# ========== MEDICATION LOOKUP (SIDEBAR) ==========
+with st.sidebar:
+    st.markdown("### 💊 Medication lookup")
+    medication_prefix = st.text_input(
+        "Start typing a medication name",
+        placeholder="e.g., Amlo",
+        help="Find the correct spelling of a medication and add it to your form"
+    )
+    if medication_prefix.strip():
+        suggestions = get_drug_index().complete(medication_prefix)
+        if suggestions:
+            st.selectbox("Matching medications", suggestions, key="medication_lookup_choice")
+            st.button("Add to current medications", on_click=add_medication, args=("drug_history",), use_container_width=True)
+            st.button("Add to drug allergies", on_click=add_medication, args=("drug_allergies",), use_container_width=True)
+        else:
+            st.caption("No matching medications found. You can still type it in the form.")
+
 # Create form
-form = st.form(key="patient_form")
+# A plain container rather than st.form, so every change reaches the server and can be autosaved
+form = st.container()
 
 # ========== BASIC INFORMATION SECTION ==========
 with form:
@@ -429,14 +272,16 @@ with form:
         patient_name = st.text_input(
             "Full Name *",
             placeholder="Enter your full name",
-            help="Please provide your full name"
+            help="Please provide your full name",
+            key="patient_name"
         )
     
     with col2:
         patient_dob = st.date_input(
             "Date of Birth *",
             value=None,
-            help="Select your date of birth"
+            help="Select your date of birth",
+            key="patient_dob"
         )
 
     # ========== PRESENTING COMPLAINT SECTION ==========
@@ -444,12 +289,9 @@ with form:
     
     presenting_complaint = st.selectbox(
         "What is your main reason for visiting today? *",
-        [
-            "Select a complaint...",
-            "Chest Pain",
-            "Other"
-        ],
-        help="Please select your main complaint from the list"
+        complaint_options(),
+        help="Please select your main complaint from the list",
+        key="presenting_complaint"
     )
 
     # ========== HISTORY OF PRESENTING COMPLAINT - TEXT INPUT BOXES ==========
@@ -459,155 +301,53 @@ with form:
     hpc_when_started = st.text_input(
         "When did it start? (e.g., today, 3 days ago, last week)",
         placeholder="Describe when your symptoms started...",
-        help="Tell us when you first noticed this symptom"
+        help="Tell us when you first noticed this symptom",
+        key="hpc_when_started"
     )
     
     hpc_progression = st.text_area(
         "How has it progressed? (e.g., getting better, getting worse, staying the same)",
         placeholder="Describe how your symptom has changed since it started...",
         height=70,
-        help="Has your symptom changed since it started?"
+        help="Has your symptom changed since it started?",
+        key="hpc_progression"
     )
     
     hpc_severity = st.text_input(
         "How severe is it? (1-10, where 1 is mild and 10 is severe)",
         placeholder="Rate your symptom severity...",
-        help="Give it a severity rating"
+        help="Give it a severity rating",
+        key="hpc_severity"
     )
     
     hpc_triggers = st.text_area(
         "What makes it worse? (e.g., movement, food, stress, position)",
         placeholder="Describe anything that makes your symptom worse...",
         height=70,
-        help="What triggers or worsens your symptom?"
+        help="What triggers or worsens your symptom?",
+        key="hpc_triggers"
     )
     
     hpc_relieving = st.text_area(
         "What makes it better? (e.g., rest, medication, position changes)",
         placeholder="Describe anything that helps your symptom...",
         height=70,
-        help="What helps improve your symptom?"
+        help="What helps improve your symptom?",
+        key="hpc_relieving"
     )
     
     hpc_associated = st.text_area(
         "Are there any other symptoms associated with this? (e.g., fever, nausea, sweating)",
         placeholder="Describe any other symptoms you're experiencing...",
         height=70,
-        help="Are there any other symptoms happening at the same time?"
+        help="Are there any other symptoms happening at the same time?",
+        key="hpc_associated"
     )
 
-    # ========== SPECIFIC QUESTIONS FOR CHEST PAIN ==========
-    if presenting_complaint == "Chest Pain":
-        st.markdown("<div class='section-header'><h2>💔 History of Chest Pain</h2></div>", unsafe_allow_html=True)
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            pain_start_date = st.date_input(
-                "When did the pain start?",
-                value=None,
-                help="Select the date when the pain began"
-            )
-        
-        with col2:
-            pain_start_time = st.time_input(
-                "What time did it start?",
-                value=None,
-                help="Select the time when the pain began (optional)"
-            )
-        
-        pain_site = st.multiselect(
-            "Where is the pain located? (Select all that apply)",
-            [
-                "Left side of chest",
-                "Right side of chest",
-                "Center of chest",
-                "Upper chest",
-                "Lower chest",
-                "Back",
-                "Not sure"
-            ],
-            help="Select the location(s) of your pain"
-        )
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            pain_onset = st.radio(
-                "How did the pain start?",
-                ["Sudden", "Gradual"],
-                help="Was the pain sudden or did it come on gradually?"
-            )
-        
-        with col2:
-            pain_character = st.multiselect(
-                "What does the pain feel like?",
-                [
-                    "Throbbing/Pounding",
-                    "Heavy/Pressure",
-                    "Tight/Squeezing",
-                    "Sharp/Stabbing",
-                    "Burning",
-                    "Dull/Aching",
-                    "Not sure"
-                ],
-                help="Describe the character of your pain"
-            )
-        
-        pain_radiation = st.multiselect(
-            "Does the pain travel anywhere else? (Select all that apply)",
-            [
-                "Left arm",
-                "Right arm",
-                "Both arms",
-                "Neck",
-                "Jaw",
-                "Back",
-                "Shoulder",
-                "No radiation"
-            ],
-            help="Select where the pain radiates to (if anywhere)"
-        )
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            pain_timing = st.radio(
-                "Is the pain constant or intermittent?",
-                ["Constant", "Intermittent (comes and goes)"],
-                help="Does the pain stay all the time or come and go?"
-            )
-        
-        with col2:
-            pain_severity = st.slider(
-                "Pain Severity",
-                min_value=0,
-                max_value=10,
-                value=5,
-                help="0 = No pain | 10 = Worst pain of your life"
-            )
-            st.caption(f"You selected: {pain_severity}/10")
-        
-        pain_exacerbating = st.text_area(
-            "What makes the pain worse? (If anything)",
-            placeholder="e.g., Movement, breathing deeply, physical activity, lying down, etc.",
-            height=80,
-            help="Describe what makes your pain worse"
-        )
-        
-        pain_relieving = st.text_area(
-            "What makes the pain better? (If anything)",
-            placeholder="e.g., Rest, medication, position changes, heat/cold, etc.",
-            height=80,
-            help="Describe what makes your pain better"
-        )
-    
-    elif presenting_complaint == "Other":
-        st.markdown("<div class='section-header'><h2>📝 History of Complaint</h2></div>", unsafe_allow_html=True)
-        
-        other_complaint_detail = st.text_area(
-            "Please describe your complaint in detail:",
-            placeholder="Describe when it started, how it developed, and any relevant details...",
-            height=150,
-            help="Provide as much detail as possible about your symptoms"
-        )
+    # ========== COMPLAINT-SPECIFIC QUESTIONS ==========
+    # Only the selected complaint's module is imported and drawn
+    complaint = load_complaint(presenting_complaint)
+    complaint_details = complaint.render_widgets() if complaint else {}
     
     # ========== SYSTEMS REVIEW SECTION ==========
     st.markdown("<div class='section-header'><h2>🔬 Systems Review</h2></div>", unsafe_allow_html=True)
@@ -616,25 +356,25 @@ with form:
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        fever = st.checkbox("Fever")
-        cough_cold = st.checkbox("Cough/Cold symptoms")
-        unwell_contacts = st.checkbox("Contact with unwell people")
-        sob = st.checkbox("Shortness of breath")
-        calf_pain = st.checkbox("Calf pain")
+        fever = st.checkbox("Fever", key="fever")
+        cough_cold = st.checkbox("Cough/Cold symptoms", key="cough_cold")
+        unwell_contacts = st.checkbox("Contact with unwell people", key="unwell_contacts")
+        sob = st.checkbox("Shortness of breath", key="sob")
+        calf_pain = st.checkbox("Calf pain", key="calf_pain")
     
     with col2:
-        recent_surgery = st.checkbox("Recent surgery")
-        travel_history = st.checkbox("Recent travel")
-        haemoptysis = st.checkbox("Coughing up blood")
-        malignancy_history = st.checkbox("History of cancer")
-        prev_vte = st.checkbox("Previous blood clot (DVT/PE)")
+        recent_surgery = st.checkbox("Recent surgery", key="recent_surgery")
+        travel_history = st.checkbox("Recent travel", key="travel_history")
+        haemoptysis = st.checkbox("Coughing up blood", key="haemoptysis")
+        malignancy_history = st.checkbox("History of cancer", key="malignancy_history")
+        prev_vte = st.checkbox("Previous blood clot (DVT/PE)", key="prev_vte")
     
     with col3:
-        orthopnea = st.checkbox("Difficulty breathing when lying flat")
-        abdominal_pain = st.checkbox("Abdominal pain")
-        vomiting = st.checkbox("Vomiting")
-        loss_consciousness = st.checkbox("Loss of consciousness")
-        dizziness = st.checkbox("Dizziness")
+        orthopnea = st.checkbox("Difficulty breathing when lying flat", key="orthopnea")
+        abdominal_pain = st.checkbox("Abdominal pain", key="abdominal_pain")
+        vomiting = st.checkbox("Vomiting", key="vomiting")
+        loss_consciousness = st.checkbox("Loss of consciousness", key="loss_consciousness")
+        dizziness = st.checkbox("Dizziness", key="dizziness")
     
     # ========== PAST MEDICAL HISTORY SECTION ==========
     st.markdown("<div class='section-header'><h2>📜 Past Medical History</h2></div>", unsafe_allow_html=True)
@@ -643,7 +383,8 @@ with form:
         "List any medical conditions you have had (e.g., diabetes, hypertension, heart disease, asthma, etc.):",
         placeholder="e.g., Type 2 Diabetes, High Blood Pressure, Asthma...",
         height=80,
-        help="Include any significant past medical conditions"
+        help="Include any significant past medical conditions",
+        key="pmh"
     )
     
     # ========== DRUG HISTORY SECTION ==========
@@ -653,8 +394,10 @@ with form:
         "List any medications you currently take (include doses if you know them):",
         placeholder="e.g., Aspirin 100mg daily, Metformin 500mg twice daily...",
         height=80,
-        help="Include medication name and dose if possible"
+        help="Include medication name and dose if possible",
+        key="drug_history"
     )
+    st.caption("Not sure of the spelling? Use the medication lookup in the sidebar (☰ at the top left).")
     
     # ========== DRUG ALLERGIES SECTION ==========
     st.markdown("<div class='section-header'><h2>⚠️ Drug Allergies</h2></div>", unsafe_allow_html=True)
@@ -664,7 +407,8 @@ with form:
         has_allergies = st.radio(
             "Do you have any drug allergies?",
             ["No", "Yes"],
-            help="Select whether you have any known drug allergies"
+            help="Select whether you have any known drug allergies",
+            key="has_allergies"
         )
     
     if has_allergies == "Yes":
@@ -673,7 +417,8 @@ with form:
                 "Please list your drug allergies and reactions:",
                 placeholder="e.g., Penicillin (rash), Aspirin (stomach upset)...",
                 height=80,
-                help="List the drug and the reaction you had"
+                help="List the drug and the reaction you had",
+                key="drug_allergies"
             )
     else:
         drug_allergies = "No known drug allergies"
@@ -683,16 +428,17 @@ with form:
     
     col1, col2 = st.columns(2)
     with col1:
-        family_heart_attack = st.checkbox("Family history of heart attack")
+        family_heart_attack = st.checkbox("Family history of heart attack", key="family_heart_attack")
     
     with col2:
-        family_stroke = st.checkbox("Family history of stroke")
+        family_stroke = st.checkbox("Family history of stroke", key="family_stroke")
     
     family_history_detail = st.text_area(
         "Any other important family medical history?",
         placeholder="e.g., Who had the condition, at what age, etc.",
         height=80,
-        help="Provide details about family members with medical conditions"
+        help="Provide details about family members with medical conditions",
+        key="family_history_detail"
     )
     
     # ========== SOCIAL HISTORY SECTION ==========
@@ -703,20 +449,23 @@ with form:
         smoking_status = st.radio(
             "Smoking status:",
             ["Never smoked", "Current smoker", "Ex-smoker"],
-            help="Select your smoking status"
+            help="Select your smoking status",
+            key="smoking_status"
         )
     
     with col2:
         alcohol_use = st.radio(
             "Alcohol use:",
             ["None", "Occasional", "Regular", "Prefer not to say"],
-            help="Select your alcohol consumption frequency"
+            help="Select your alcohol consumption frequency",
+            key="alcohol_use"
         )
     
     recreational_drugs = st.radio(
         "Recreational drug use:",
         ["No", "Yes", "Prefer not to say"],
-        help="Select whether you use recreational drugs"
+        help="Select whether you use recreational drugs",
+        key="recreational_drugs"
     )
     
     if recreational_drugs == "Yes":
@@ -724,7 +473,8 @@ with form:
             "Please specify:",
             placeholder="Type of drug and frequency of use...",
             height=80,
-            help="Provide details about recreational drug use"
+            help="Provide details about recreational drug use",
+            key="recreational_drugs_detail"
         )
     else:
         recreational_drugs_detail = ""
@@ -736,7 +486,8 @@ with form:
         "Is there anything else you would like to tell the doctor?",
         placeholder="Any other relevant information about your health or current symptoms...",
         height=100,
-        help="Add any other important information"
+        help="Add any other important information",
+        key="additional_info"
     )
     
     # ========== RECEIVING EMAIL SECTION ==========
@@ -745,19 +496,50 @@ with form:
     receiving_email = st.text_input(
         "Receiving Email Address *",
         placeholder="doctor@clinic.com",
-        help="Enter the email address where this form should be sent"
+        help="Enter the email address where this form should be sent",
+        key="receiving_email"
     )
     
     patient_email = st.text_input(
         "Your Email Address (optional)",
         placeholder="your.email@example.com",
-        help="Enter your email address if you'd like a copy of your submission"
+        help="Enter your email address if you'd like a copy of your submission",
+        key="patient_email"
     )
     
     st.divider()
     
+    draft_fields = DRAFT_FIELDS + (complaint.FIELDS if complaint else ())
+    form_values = {field: st.session_state[field] for field in draft_fields if field in st.session_state}
+    
+    # Autosave changed fields (debounced) until the form has been sent
+    if not st.session_state.form_submitted:
+        st.session_state.draft.checkpoint(form_values)
+    
+    # Re-check only the fields that changed since the last rerun
+    rules = compile_rules(presenting_complaint)
+    validator = st.session_state.get("validator")
+    if validator is None or validator.compiled is not rules:
+        # New session or a different complaint: check everything once
+        validator = st.session_state.validator = IncrementalValidator(rules)
+        validator.update(form_values)
+        changed = {"presenting_complaint"} if "touched_fields" in st.session_state else set()
+    else:
+        changed = validator.update(form_values)
+    st.session_state.setdefault("touched_fields", set()).update(changed)
+    
+    # Show problems with the fields the patient has already filled in
+    for problems in (validator.errors, validator.warnings):
+        for field, message in problems.items():
+            if field in st.session_state.touched_fields:
+                st.warning(f"⚠️ {message}")
+    
+    # Let the patient know before submitting if email delivery is down
+    if get_smtp_breaker().state != CLOSED:
+        st.info("📭 Email delivery is temporarily unavailable. Your answers are saved as you go - you can submit in a few minutes.")
+    
     # Submit button
-    submitted = st.form_submit_button(
+    submitted = st.button(
         "✅ Submit Form",
         use_container_width=True,
         type="primary"
@@ -765,20 +547,8 @@ with form:
     
     # Form validation and submission
     if submitted:
-        # Validation
-        errors = []
-        
-        if not patient_name or patient_name.strip() == "":
-            errors.append("Full name is required")
-        
-        if patient_dob is None:
-            errors.append("Date of birth is required")
-        
-        if presenting_complaint == "Select a complaint...":
-            errors.append("Please select a presenting complaint")
-        
-        if not receiving_email or not re.match(r'^[\w\.-]+@[\w\.-]+\.\w+$', receiving_email):
-            errors.append("Please enter a valid receiving email address")
+        # Validation (already up to date for the current values)
+        errors = list(validator.errors.values())
         
         # Display errors
         if errors:
@@ -787,20 +557,11 @@ with form:
                 st.write(f"• {error}")
         else:
             # Prepare form data
+            render_started = time.perf_counter()
             form_data = prepare_form_data(
                 patient_name, patient_dob, presenting_complaint,
                 hpc_when_started, hpc_progression, hpc_severity, hpc_triggers, hpc_relieving, hpc_associated,
-                pain_start_date if presenting_complaint == "Chest Pain" else None,
-                pain_start_time if presenting_complaint == "Chest Pain" else None,
-                pain_site if presenting_complaint == "Chest Pain" else None,
-                pain_onset if presenting_complaint == "Chest Pain" else None,
-                pain_character if presenting_complaint == "Chest Pain" else None,
-                pain_radiation if presenting_complaint == "Chest Pain" else None,
-                pain_timing if presenting_complaint == "Chest Pain" else None,
-                pain_severity if presenting_complaint == "Chest Pain" else None,
-                pain_exacerbating if presenting_complaint == "Chest Pain" else None,
-                pain_relieving if presenting_complaint == "Chest Pain" else None,
-                other_complaint_detail if presenting_complaint == "Other" else None,
+                complaint_details,
                 fever, cough_cold, unwell_contacts, sob, calf_pain, recent_surgery,
                 travel_history, haemoptysis, malignancy_history, prev_vte, orthopnea,
                 abdominal_pain, vomiting, loss_consciousness, dizziness,
@@ -808,11 +569,17 @@ with form:
                 family_history_detail, smoking_status, alcohol_use, recreational_drugs,
                 recreational_drugs_detail, additional_info
             )
+            fingerprint = submission_fingerprint(form_data)
+            audit_log = get_audit_log()
+            audit_log.record("submitted", fingerprint=fingerprint)
+            audit_log.record("rendered", fingerprint=fingerprint,
+                             duration_ms=round((time.perf_counter() - render_started) * 1000, 1))
             
             # Try to send email
             with st.spinner("Sending form..."):
-                if send_email(receiving_email, form_data, patient_email):
+                if send_email(receiving_email, form_data, patient_email, fingerprint):
                     st.session_state.form_submitted = True
+                    st.session_state.draft.discard()
                     st.success("✅ Form submitted successfully!")
                     st.balloons()
                     st.info(f"Your form has been sent to: {receiving_email}")
@@ -0,0 +1,286 @@
+"""Append-only audit trail of form submissions and email delivery.
+
+Events are small JSON objects, one per line, e.g.
+
+    {"ts":"2026-10-19T09:12:03.120511+00:00","phase":"delivered","fingerprint":"3f9c...","recipient":"clinic","smtp_code":250,"duration_ms":812.4}
+
+They identify a submission only by its fingerprint (a hash of the rendered
+form), never by patient details. record() only puts the event on a queue;
+a background writer appends batches to the active segment and fsyncs once a
+batch is full or the flush interval has passed. If a write fails (e.g. the
+disk is full) the batch is kept and retried with backoff, and events that do
+not fit in the queue meanwhile are counted in `dropped` and logged. Segments
+are rotated by size and gzip-compressed.
+
+Query the trail from the command line:
+
+    python audit.py --dir audit_logs --phase failed --since 2026-10-01
+    python audit.py --dir audit_logs --fingerprint 3f9c --count
+"""
+import argparse
+import atexit
+import glob
+import gzip
+import hashlib
+import json
+import logging
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+DEFAULT_AUDIT_LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "audit_logs")
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_FLUSH_INTERVAL_SECONDS = 1.0
+DEFAULT_MAX_SEGMENT_BYTES = 64 * 1024 * 1024
+DEFAULT_RETRY_DELAY_SECONDS = 0.5
+DEFAULT_MAX_RETRY_DELAY_SECONDS = 30.0
+DEFAULT_CLOSE_TIMEOUT_SECONDS = 5.0
+DROPPED_LOG_EVERY = 1000
+
+ACTIVE_SEGMENT = "audit.jsonl"
+SEGMENT_TIME_FORMAT = "%Y%m%dT%H%M%S%fZ"
+
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+def submission_fingerprint(form_data):
+    """Identify a rendered form without storing its contents"""
+    return hashlib.sha256(form_data.encode("utf-8")).hexdigest()[:32]
+
+
+class AuditLog:
+    """Batched, asynchronous writer of audit events"""
+
+    def __init__(self, directory=DEFAULT_AUDIT_LOG_DIR, batch_size=DEFAULT_BATCH_SIZE,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL_SECONDS, max_segment_bytes=DEFAULT_MAX_SEGMENT_BYTES,
+                 max_queue=100000, retry_delay=DEFAULT_RETRY_DELAY_SECONDS,
+                 max_retry_delay=DEFAULT_MAX_RETRY_DELAY_SECONDS):
+        self.directory = directory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_segment_bytes = max_segment_bytes
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.dropped = 0
+        self.write_errors = 0
+        os.makedirs(directory, exist_ok=True)
+
+        self._closed = False
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._file = open(os.path.join(directory, ACTIVE_SEGMENT), "ab")
+        self._writer = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._writer.start()
+
+    def record(self, phase, **fields):
+        """Queue an event without waiting for disk; counts it as dropped if the queue is full"""
+        event = {"ts": datetime.now(timezone.utc).isoformat(), "phase": phase}
+        event.update(fields)
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % DROPPED_LOG_EVERY == 0:
+                logger.error("Audit queue full, %d events dropped so far", self.dropped)
+
+    def close(self, timeout=DEFAULT_CLOSE_TIMEOUT_SECONDS):
+        """Write any queued events and stop the writer, giving up after `timeout` seconds"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass
+            self._writer.join(timeout)
+        if self._writer.is_alive():
+            logger.error("Audit writer did not finish within %.1fs; %d queued events were not written",
+                         timeout, self._queue.qsize())
+        else:
+            self._file.close()
+        if self.dropped:
+            logger.error("%d audit events were dropped", self.dropped)
+
+    def _run(self):
+        batch = []
+        stopping = False
+        failures = 0
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            # While a full batch is being retried, leave new events in the queue
+            if not stopping and len(batch) < self.batch_size:
+                try:
+                    event = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    event = None
+                if event is _STOP:
+                    stopping = True
+                elif event is not None:
+                    batch.append(json.dumps(event, separators=(",", ":"), default=str).encode("utf-8") + b"\n")
+
+            if batch and (stopping or len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                try:
+                    self._write(batch)
+                except Exception:
+                    failures += 1
+                    self.write_errors += 1
+                    delay = min(self.max_retry_delay, self.retry_delay * 2 ** (failures - 1))
+                    logger.exception("Could not write %d audit events (attempt %d), retrying in %.1fs",
+                                     len(batch), failures, delay)
+                    time.sleep(delay)
+                    continue
+                batch = []
+                failures = 0
+                deadline = time.monotonic() + self.flush_interval
+            elif not batch and time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval
+
+            if stopping and not batch:
+                return
+
+    def _write(self, batch):
+        start = None
+        try:
+            start = self._file.tell()
+            self._file.write(b"".join(batch))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except Exception:
+            # Drop whatever part of the batch reached the file, so the retry does not duplicate it
+            try:
+                self._reopen(truncate_to=start)
+            except OSError:
+                logger.exception("Could not reopen the active audit segment")
+            raise
+
+        if self._file.tell() >= self.max_segment_bytes:
+            # The batch is already on disk, so a failed rotation is only logged and retried after the next batch
+            try:
+                self._rotate()
+            except Exception:
+                logger.exception("Could not rotate the audit log")
+
+    def _reopen(self, truncate_to=None):
+        try:
+            self._file.close()
+        except OSError:
+            pass
+        active = os.path.join(self.directory, ACTIVE_SEGMENT)
+        if truncate_to is not None:
+            os.truncate(active, truncate_to)
+        self._file = open(active, "ab")
+
+    def _rotate(self):
+        self._file.close()
+        active = os.path.join(self.directory, ACTIVE_SEGMENT)
+        # Named by rotation time, so every event in the segment is older than its name
+        rotated = os.path.join(self.directory, f"audit-{datetime.now(timezone.utc).strftime(SEGMENT_TIME_FORMAT)}.jsonl")
+        try:
+            os.replace(active, rotated)
+        finally:
+            self._file = open(active, "ab")
+
+        try:
+            with open(rotated, "rb") as src, gzip.open(rotated + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+        except Exception:
+            # Keep the uncompressed segment, which queries also read
+            if os.path.exists(rotated + ".gz"):
+                os.remove(rotated + ".gz")
+            raise
+        os.remove(rotated)
+
+
+def _segments(directory, since=None):
+    """Yield segment paths oldest first, skipping rotated segments that end before `since`"""
+    # Rotated segments are gzipped, unless compressing one failed
+    rotated = glob.glob(os.path.join(directory, "audit-*.jsonl.gz")) + glob.glob(os.path.join(directory, "audit-*.jsonl"))
+    for path in sorted(rotated):
+        if since is not None:
+            stamp = os.path.basename(path)[len("audit-"):].split(".", 1)[0]
+            if datetime.strptime(stamp, SEGMENT_TIME_FORMAT).replace(tzinfo=timezone.utc) < since:
+                continue
+        yield path
+    active = os.path.join(directory, ACTIVE_SEGMENT)
+    if os.path.exists(active):
+        yield active
+
+
+def scan(directory=DEFAULT_AUDIT_LOG_DIR, phase=None, fingerprint=None, since=None, until=None):
+    """Yield the raw lines of events matching all of the given filters.
+
+    `since` and `until` are timezone-aware datetimes. Filters are applied to
+    the raw bytes, so no JSON is parsed while scanning.
+    """
+    phase_bytes = f'"phase":"{phase}"'.encode("utf-8") if phase else None
+    fingerprint_bytes = f'"fingerprint":"{fingerprint}'.encode("utf-8") if fingerprint else None
+    # Every event starts with {"ts":"<UTC isoformat>", and those compare correctly as bytes
+    since_bytes = since.astimezone(timezone.utc).isoformat().encode("ascii") if since else None
+    until_bytes = until.astimezone(timezone.utc).isoformat().encode("ascii") if until else None
+    ts_start = len(b'{"ts":"')
+
+    for path in _segments(directory, since):
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rb") as f:
+            for line in f:
+                if phase_bytes and phase_bytes not in line:
+                    continue
+                if fingerprint_bytes and fingerprint_bytes not in line:
+                    continue
+                if since_bytes or until_bytes:
+                    ts = line[ts_start:line.find(b'"', ts_start)]
+                    if since_bytes and ts < since_bytes:
+                        continue
+                    if until_bytes and ts >= until_bytes:
+                        continue
+                if not line.endswith(b"\n"):
+                    continue  # Partially written last line
+                yield line
+
+
+def query(directory=DEFAULT_AUDIT_LOG_DIR, phase=None, fingerprint=None, since=None, until=None):
+    """Yield matching events as dicts"""
+    for line in scan(directory, phase, fingerprint, since, until):
+        yield json.loads(line)
+
+
+def open_audit_log(directory=DEFAULT_AUDIT_LOG_DIR, **kwargs):
+    """Create an AuditLog that is flushed when the process exits"""
+    log = AuditLog(directory, **kwargs)
+    atexit.register(log.close)
+    return log
+
+
+def _parse_time(text):
+    value = datetime.fromisoformat(text)
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search the submission audit trail.")
+    parser.add_argument("--dir", default=DEFAULT_AUDIT_LOG_DIR, help="audit log directory")
+    parser.add_argument("--phase", help="submitted, rendered, delivered or failed")
+    parser.add_argument("--fingerprint", help="submission fingerprint (or its prefix)")
+    parser.add_argument("--since", type=_parse_time, help="ISO date/time, UTC unless given")
+    parser.add_argument("--until", type=_parse_time, help="ISO date/time, UTC unless given")
+    parser.add_argument("--count", action="store_true", help="print only the number of matching events")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    lines = scan(args.dir, args.phase, args.fingerprint, args.since, args.until)
+    if args.count:
+        print(sum(1 for _ in lines))
+    else:
+        for line in lines:
+            sys.stdout.write(line.decode("utf-8"))
+    print(f"Scanned in {time.perf_counter() - started:.2f} s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
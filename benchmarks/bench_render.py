@@ -0,0 +1,76 @@
+"""Benchmark form rendering throughput on one node.
+
+Renders synthetic submissions with prepare_form_data single-threaded, on a
+thread pool and on a process pool, and reports submissions per second and
+per core for each mode:
+
+    python benchmarks/bench_render.py --count 50000 --workers 8
+
+Submissions are generated before timing starts. The process-pool figure
+includes sending submissions to the workers and the HTML back.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from complaints import REGISTRY, load_complaint  # noqa: E402
+from form_render import prepare_form_data  # noqa: E402
+from synthetic import SubmissionGenerator  # noqa: E402
+
+
+def render_chunk(chunk):
+    """Render a list of submissions and return the total HTML size"""
+    return sum(len(prepare_form_data(**submission)) for submission in chunk)
+
+
+def warm_up():
+    """Import every complaint module so imports are not timed"""
+    for name in REGISTRY:
+        load_complaint(name)
+
+
+def run(mode, chunks, workers):
+    if mode == "single":
+        started = time.perf_counter()
+        for chunk in chunks:
+            render_chunk(chunk)
+        return time.perf_counter() - started
+
+    executor_class = ThreadPoolExecutor if mode == "thread" else ProcessPoolExecutor
+    with executor_class(max_workers=workers, **({"initializer": warm_up} if mode == "process" else {})) as executor:
+        # Start every worker before timing
+        list(executor.map(render_chunk, [chunk[:1] for chunk in chunks[:workers]]))
+        started = time.perf_counter()
+        list(executor.map(render_chunk, chunks))
+        return time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark form rendering throughput.")
+    parser.add_argument("--count", type=int, default=20000, help="number of submissions to render")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the synthetic submissions")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="pool size for thread and process modes")
+    parser.add_argument("--chunk-size", type=int, default=500, help="submissions per pool task")
+    parser.add_argument("--modes", default="single,thread,process", help="comma-separated modes to run")
+    args = parser.parse_args(argv)
+
+    warm_up()
+    submissions = list(islice(iter(SubmissionGenerator(args.seed)), args.count))
+    chunks = [submissions[i:i + args.chunk_size] for i in range(0, len(submissions), args.chunk_size)]
+
+    print(f"{args.count} submissions, {args.workers} workers, {os.cpu_count()} CPUs")
+    print(f"{'mode':<8} {'seconds':>8} {'subs/s':>10} {'subs/s/core':>12}")
+    for mode in args.modes.split(","):
+        seconds = run(mode, chunks, args.workers)
+        cores = 1 if mode == "single" else min(args.workers, os.cpu_count())
+        rate = args.count / seconds
+        print(f"{mode:<8} {seconds:8.2f} {rate:10.0f} {rate / cores:12.0f}")
+
+
+if __name__ == "__main__":
+    main()
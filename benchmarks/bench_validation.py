@@ -0,0 +1,84 @@
+"""Benchmark form validation: a full check versus per-rerun incremental checks.
+
+    python benchmarks/bench_validation.py
+"""
+import os
+import sys
+import timeit
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from validation import IncrementalValidator, compile_rules, validate  # noqa: E402
+
+VALUES = {
+    "patient_name": "Jane Example",
+    "patient_dob": date(1970, 5, 17),
+    "presenting_complaint": "Chest Pain",
+    "hpc_when_started": "Two days ago",
+    "hpc_progression": "Getting worse",
+    "hpc_severity": "7/10",
+    "hpc_triggers": "Climbing stairs",
+    "hpc_relieving": "Rest",
+    "hpc_associated": "Sweating",
+    "pain_start_date": date(2026, 10, 17),
+    "pain_start_time": None,
+    "pain_site": ["Center of chest"],
+    "pain_onset": "Sudden",
+    "pain_character": ["Heavy/Pressure", "Tight/Squeezing"],
+    "pain_radiation": ["Left arm", "Jaw"],
+    "pain_timing": "Constant",
+    "pain_severity": 7,
+    "pain_exacerbating": "Exertion",
+    "pain_relieving": "Rest",
+    "fever": False, "cough_cold": False, "unwell_contacts": False, "sob": True, "calf_pain": False,
+    "recent_surgery": False, "travel_history": False, "haemoptysis": False, "malignancy_history": False,
+    "prev_vte": False, "orthopnea": False, "abdominal_pain": False, "vomiting": False,
+    "loss_consciousness": False, "dizziness": True,
+    "pmh": "Hypertension, type 2 diabetes",
+    "drug_history": "Amlodipine 5mg daily, Metformin 500mg twice daily",
+    "has_allergies": "Yes",
+    "drug_allergies": "Penicillin (rash)",
+    "family_heart_attack": True, "family_stroke": False,
+    "family_history_detail": "Father had a heart attack at 55",
+    "smoking_status": "Ex-smoker",
+    "alcohol_use": "Occasional",
+    "recreational_drugs": "No",
+    "recreational_drugs_detail": "",
+    "additional_info": "",
+    "receiving_email": "doctor@clinic.example",
+    "patient_email": "",
+}
+
+
+def per_call_us(stmt, number):
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1_000_000
+
+
+def main():
+    number = 20000
+    compile_rules(VALUES["presenting_complaint"])
+
+    validator = IncrementalValidator(compile_rules(VALUES["presenting_complaint"]))
+    validator.update(VALUES)
+    counter = iter(range(10 ** 9))
+
+    def alternating(field, first, second):
+        versions = (dict(VALUES, **{field: first}), dict(VALUES, **{field: second}))
+        return lambda: validator.update(versions[next(counter) % 2])
+
+    results = [
+        ("Full validation", per_call_us(lambda: validate(VALUES), number)),
+        ("Incremental, nothing changed", per_call_us(lambda: validator.update(VALUES), number)),
+        ("Incremental, unvalidated field", per_call_us(alternating("additional_info", "", "x"), number)),
+        ("Incremental, email changed", per_call_us(
+            alternating("receiving_email", "a@clinic.example", "b@clinic.example"), number)),
+        ("Incremental, allergy toggled", per_call_us(alternating("has_allergies", "No", "Yes"), number)),
+    ]
+    print(f"{len(compile_rules(VALUES['presenting_complaint']).rules)} rules, {len(VALUES)} fields")
+    for name, us in results:
+        print(f"{name:<34} {us:8.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Circuit breaker for email delivery.
+
+After `failure_threshold` consecutive failures the breaker opens, and
+callers fail fast instead of waiting on a dead server. While it is open a
+background thread probes the server. Once a probe succeeds, or
+`reset_timeout` has passed, the breaker goes half-open and lets a single
+trial delivery through. The breaker closes if the trial succeeds and opens
+again if it fails.
+
+Only errors showing that the server is unreachable or unavailable count as
+failures (see counts_as_failure). Errors from a server that is up, such as a
+rejected recipient or a wrong password, leave the breaker as it is.
+"""
+import logging
+import smtplib
+import socket
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+logger = logging.getLogger(__name__)
+
+
+# Errors that mean the server could not be reached or dropped the connection
+UNAVAILABLE_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    socket.timeout,
+    socket.gaierror,
+    smtplib.SMTPServerDisconnected,
+    smtplib.SMTPConnectError,
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open"""
+
+
+class RecordingSMTP(smtplib.SMTP):
+    """SMTP connection that keeps the server's reply code to the last message sent"""
+    data_reply_code = None
+
+    def data(self, msg):
+        code, response = super().data(msg)
+        self.data_reply_code = code
+        return code, response
+
+
+def open_smtp(host, port, connect_timeout, read_timeout):
+    """Open an SMTP connection with explicit connect and read timeouts"""
+    # The connect timeout covers the TCP connection and the server's greeting
+    server = RecordingSMTP(host, port, timeout=connect_timeout)
+    server.sock.settimeout(read_timeout)
+    return server
+
+
+def counts_as_failure(error):
+    """Whether an error means the email server is unreachable or unavailable"""
+    if isinstance(error, UNAVAILABLE_ERRORS):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code == 421  # Service not available
+    return False
+
+
+def smtp_probe(host, port, timeout):
+    """Return True if an SMTP server accepts a connection and greets with 220"""
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            with sock.makefile("rb") as f:
+                greeting = f.readline(512)
+            if not greeting.startswith(b"220"):
+                return False
+            sock.sendall(b"QUIT\r\n")
+            return True
+    except OSError:
+        return False
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker shared by all sessions"""
+
+    def __init__(self, failure_threshold=3, reset_timeout=30.0, probe=None, probe_interval=5.0,
+                 on_state_change=None):
+        """on_state_change(old_state, stats) is called on every change of state, with a stats() snapshot"""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe = probe
+        self.probe_interval = probe_interval
+        self.on_state_change = on_state_change
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._total_failures = 0
+        self._total_rejected = 0
+        self._last_probe_ok = None
+
+        self._prober = None
+        self._stop = threading.Event()
+
+    @property
+    def state(self):
+        """closed, open or half_open"""
+        with self._lock:
+            return self._current_state()
+
+    def allow(self):
+        """Return True if a call may go ahead; in half-open state only one trial at a time"""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self._total_rejected += 1
+            return False
+
+    def record_success(self):
+        """Close the circuit after a successful call"""
+        with self._lock:
+            self._consecutive_failures = 0
+            self._trial_in_flight = False
+            self._set_state(CLOSED)
+
+    def record_failure(self):
+        """Count a failed call, opening the circuit at the threshold or when a trial fails"""
+        with self._lock:
+            self._consecutive_failures += 1
+            self._total_failures += 1
+            was_trial = self._trial_in_flight
+            self._trial_in_flight = False
+            if was_trial or self._consecutive_failures >= self.failure_threshold:
+                self._open()
+
+    def release(self):
+        """End a call whose outcome says nothing about the server's health"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def call(self, func, *args, **kwargs):
+        """Run func through the breaker, raising CircuitOpenError instead if the circuit is open"""
+        if not self.allow():
+            raise CircuitOpenError("Circuit is open")
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if counts_as_failure(e):
+                self.record_failure()
+            else:
+                self.release()
+            raise
+        self.record_success()
+        return result
+
+    def stats(self):
+        """Snapshot of the breaker's state and counters, for the UI and metrics"""
+        with self._lock:
+            self._current_state()
+            return self._stats()
+
+    def start_prober(self):
+        """Start the background thread that probes the server while the circuit is open"""
+        if self.probe is None or self._prober is not None:
+            return
+
+        def run():
+            while not self._stop.wait(self.probe_interval):
+                if self.state != OPEN:
+                    continue
+                ok = self.probe()
+                with self._lock:
+                    self._last_probe_ok = ok
+                    if ok and self._state == OPEN:
+                        self._set_state(HALF_OPEN)
+
+        self._prober = threading.Thread(target=run, name="smtp-breaker-probe", daemon=True)
+        self._prober.start()
+
+    def close(self):
+        """Stop the prober"""
+        self._stop.set()
+        if self._prober is not None:
+            self._prober.join()
+
+    # Callers hold self._lock for the methods below
+    def _current_state(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._set_state(HALF_OPEN)
+        return self._state
+
+    def _stats(self):
+        return {
+            "state": self._state,
+            "consecutive_failures": self._consecutive_failures,
+            "total_failures": self._total_failures,
+            "total_rejected": self._total_rejected,
+            "opened_seconds_ago": None if self._opened_at is None else round(time.monotonic() - self._opened_at, 1),
+            "last_probe_ok": self._last_probe_ok,
+        }
+
+    def _open(self):
+        self._opened_at = time.monotonic()
+        self._set_state(OPEN)
+
+    def _set_state(self, state):
+        if state == self._state:
+            return
+        old, self._state = self._state, state
+        stats = self._stats()
+        if state == CLOSED:
+            self._opened_at = None
+        logger.warning("Email circuit breaker %s -> %s %s", old, state, stats)
+        if self.on_state_change is not None:
+            self.on_state_change(old, stats)
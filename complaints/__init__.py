@@ -0,0 +1,45 @@
+"""Registry of presenting-complaint modules.
+
+Each complaint lives in its own module in this package and is only imported
+when a patient selects it. A complaint module defines:
+
+- NAME: the label shown in the complaint dropdown
+- FIELDS: the widget keys of its questions (also saved in drafts)
+- render_widgets(): draws its questions and returns their values as a dict
+- RULES: validation rules for its fields (see validation.py)
+- render_section(values): returns its HTML section for the emailed form,
+  filled in from a string.Template compiled when the module is imported
+
+Only render_widgets() imports Streamlit, so the rules and sections can be
+used outside the app.
+
+To add a complaint, create a module with these names and register it below.
+"""
+import importlib
+
+PLACEHOLDER = "Select a complaint..."
+
+# Dropdown label -> module in this package, in dropdown order
+REGISTRY = {
+    "Chest Pain": "chest_pain",
+    "Shortness of Breath": "shortness_of_breath",
+    "Headache": "headache",
+    "Abdominal Pain": "abdominal_pain",
+    "Other": "other",
+}
+
+
+def complaint_options():
+    """Return the options for the complaint dropdown"""
+    return [PLACEHOLDER, *REGISTRY]
+
+
+def load_complaint(name):
+    """Import and return the module for a complaint, or None if there is none.
+
+    Modules are imported on first use and then served from the import cache.
+    """
+    module_name = REGISTRY.get(name)
+    if module_name is None:
+        return None
+    return importlib.import_module(f"{__name__}.{module_name}")
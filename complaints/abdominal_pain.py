@@ -0,0 +1,159 @@
+"""Abdominal pain: detailed history of presenting complaint"""
+from string import Template
+
+from validation import int_range, not_in_future
+
+NAME = "Abdominal Pain"
+
+FIELDS = (
+    "abdo_start_date", "abdo_site", "abdo_character", "abdo_severity",
+    "abdo_bowels", "abdo_last_period", "abdo_exacerbating", "abdo_relieving",
+)
+
+RULES = (
+    not_in_future("abdo_start_date", "The date your pain started cannot be in the future"),
+    int_range("abdo_severity", 0, 10, "Abdominal pain severity must be between 0 and 10"),
+    not_in_future("abdo_last_period", "The date of your last period cannot be in the future"),
+)
+
+SECTION_TEMPLATE = Template("""
+        <div class="section">
+            <h2>Additional Abdominal Pain Details</h2>
+            <div class="field">
+                <span class="label">When did the pain start:</span>
+                <span class="value">$abdo_start_date</span>
+            </div>
+            <div class="field">
+                <span class="label">Site of Pain:</span>
+                <span class="value">$abdo_site</span>
+            </div>
+            <div class="field">
+                <span class="label">Character of Pain:</span>
+                <span class="value">$abdo_character</span>
+            </div>
+            <div class="field">
+                <span class="label">Severity (0-10):</span>
+                <span class="value">$abdo_severity/10</span>
+            </div>
+            <div class="field">
+                <span class="label">Bowel Changes:</span>
+                <span class="value">$abdo_bowels</span>
+            </div>
+            <div class="field">
+                <span class="label">First Day of Last Period:</span>
+                <span class="value">$abdo_last_period</span>
+            </div>
+            <div class="field">
+                <span class="label">Exacerbating Factors:</span>
+                <span class="value">$abdo_exacerbating</span>
+            </div>
+            <div class="field">
+                <span class="label">Relieving Factors:</span>
+                <span class="value">$abdo_relieving</span>
+            </div>
+        </div>
+        """)
+
+
+def render_widgets():
+    """Draw the abdominal pain questions and return their values"""
+    import streamlit as st
+
+    st.markdown("<div class='section-header'><h2>🩺 History of Abdominal Pain</h2></div>", unsafe_allow_html=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        abdo_start_date = st.date_input(
+            "When did the pain start?",
+            value=None,
+            help="Select the date when the pain began",
+            key="abdo_start_date"
+        )
+
+    with col2:
+        abdo_site = st.multiselect(
+            "Where is the pain? (Select all that apply)",
+            ["Upper middle", "Upper right", "Upper left", "Around the belly button",
+             "Lower right", "Lower left", "Lower middle", "All over"],
+            help="Select the location(s) of your pain",
+            key="abdo_site"
+        )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        abdo_character = st.multiselect(
+            "What does the pain feel like?",
+            ["Cramping (comes in waves)", "Sharp/Stabbing", "Burning", "Dull/Aching", "Not sure"],
+            help="Describe the character of your pain",
+            key="abdo_character"
+        )
+
+    with col2:
+        # Default set through session state so a restored draft can override it
+        st.session_state.setdefault("abdo_severity", 5)
+        abdo_severity = st.slider(
+            "Pain Severity",
+            min_value=0,
+            max_value=10,
+            help="0 = No pain | 10 = Worst pain of your life",
+            key="abdo_severity"
+        )
+
+    abdo_bowels = st.multiselect(
+        "Have you noticed any changes in your bowels?",
+        ["Diarrhoea", "Constipation", "Blood in stool", "Black stool", "No changes"],
+        help="Select any that apply",
+        key="abdo_bowels"
+    )
+
+    abdo_last_period = st.date_input(
+        "If applicable, when did your last period start?",
+        value=None,
+        help="Leave blank if this does not apply to you",
+        key="abdo_last_period"
+    )
+
+    abdo_exacerbating = st.text_area(
+        "What makes the pain worse? (If anything)",
+        placeholder="e.g., Eating, movement, coughing, etc.",
+        height=80,
+        help="Describe what makes your pain worse",
+        key="abdo_exacerbating"
+    )
+
+    abdo_relieving = st.text_area(
+        "What makes the pain better? (If anything)",
+        placeholder="e.g., Lying still, passing wind, antacids, etc.",
+        height=80,
+        help="Describe what makes your pain better",
+        key="abdo_relieving"
+    )
+
+    return {
+        "abdo_start_date": abdo_start_date,
+        "abdo_site": abdo_site,
+        "abdo_character": abdo_character,
+        "abdo_severity": abdo_severity,
+        "abdo_bowels": abdo_bowels,
+        "abdo_last_period": abdo_last_period,
+        "abdo_exacerbating": abdo_exacerbating,
+        "abdo_relieving": abdo_relieving,
+    }
+
+
+def render_section(values):
+    """Render the abdominal pain details as HTML"""
+    abdo_site = values.get("abdo_site")
+    abdo_character = values.get("abdo_character")
+    abdo_bowels = values.get("abdo_bowels")
+
+    return SECTION_TEMPLATE.substitute(
+        abdo_start_date=values.get("abdo_start_date") or 'Not specified',
+        abdo_site=', '.join(abdo_site) if abdo_site else 'Not specified',
+        abdo_character=', '.join(abdo_character) if abdo_character else 'Not specified',
+        abdo_severity=values.get("abdo_severity"),
+        abdo_bowels=', '.join(abdo_bowels) if abdo_bowels else 'Not specified',
+        abdo_last_period=values.get("abdo_last_period") or 'Not applicable',
+        abdo_exacerbating=values.get("abdo_exacerbating") or 'None reported',
+        abdo_relieving=values.get("abdo_relieving") or 'None reported',
+    )
@@ -0,0 +1,209 @@
+"""Chest pain: detailed history of presenting complaint"""
+from string import Template
+
+from validation import int_range, not_in_future
+
+NAME = "Chest Pain"
+
+FIELDS = (
+    "pain_start_date", "pain_start_time", "pain_site", "pain_onset", "pain_character",
+    "pain_radiation", "pain_timing", "pain_severity", "pain_exacerbating", "pain_relieving",
+)
+
+RULES = (
+    not_in_future("pain_start_date", "The date your chest pain started cannot be in the future"),
+    int_range("pain_severity", 0, 10, "Chest pain severity must be between 0 and 10"),
+)
+
+SECTION_TEMPLATE = Template("""
+        <div class="section">
+            <h2>Additional Chest Pain Details</h2>
+            <div class="field">
+                <span class="label">When did the pain start:</span>
+                <span class="value">$pain_start</span>
+            </div>
+            <div class="field">
+                <span class="label">Site of Pain:</span>
+                <span class="value">$pain_site</span>
+            </div>
+            <div class="field">
+                <span class="label">Onset:</span>
+                <span class="value">$pain_onset</span>
+            </div>
+            <div class="field">
+                <span class="label">Character of Pain:</span>
+                <span class="value">$pain_character</span>
+            </div>
+            <div class="field">
+                <span class="label">Radiation:</span>
+                <span class="value">$pain_radiation</span>
+            </div>
+            <div class="field">
+                <span class="label">Timing:</span>
+                <span class="value">$pain_timing</span>
+            </div>
+            <div class="field">
+                <span class="label">Severity (0-10):</span>
+                <span class="value">$pain_severity/10</span>
+            </div>
+            <div class="field">
+                <span class="label">Exacerbating Factors:</span>
+                <span class="value">$pain_exacerbating</span>
+            </div>
+            <div class="field">
+                <span class="label">Relieving Factors:</span>
+                <span class="value">$pain_relieving</span>
+            </div>
+        </div>
+        """)
+
+
+def render_widgets():
+    """Draw the chest pain questions and return their values"""
+    import streamlit as st
+
+    st.markdown("<div class='section-header'><h2>💔 History of Chest Pain</h2></div>", unsafe_allow_html=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        pain_start_date = st.date_input(
+            "When did the pain start?",
+            value=None,
+            help="Select the date when the pain began",
+            key="pain_start_date"
+        )
+
+    with col2:
+        pain_start_time = st.time_input(
+            "What time did it start?",
+            value=None,
+            help="Select the time when the pain began (optional)",
+            key="pain_start_time"
+        )
+
+    pain_site = st.multiselect(
+        "Where is the pain located? (Select all that apply)",
+        [
+            "Left side of chest",
+            "Right side of chest",
+            "Center of chest",
+            "Upper chest",
+            "Lower chest",
+            "Back",
+            "Not sure"
+        ],
+        help="Select the location(s) of your pain",
+        key="pain_site"
+    )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        pain_onset = st.radio(
+            "How did the pain start?",
+            ["Sudden", "Gradual"],
+            help="Was the pain sudden or did it come on gradually?",
+            key="pain_onset"
+        )
+
+    with col2:
+        pain_character = st.multiselect(
+            "What does the pain feel like?",
+            [
+                "Throbbing/Pounding",
+                "Heavy/Pressure",
+                "Tight/Squeezing",
+                "Sharp/Stabbing",
+                "Burning",
+                "Dull/Aching",
+                "Not sure"
+            ],
+            help="Describe the character of your pain",
+            key="pain_character"
+        )
+
+    pain_radiation = st.multiselect(
+        "Does the pain travel anywhere else? (Select all that apply)",
+        [
+            "Left arm",
+            "Right arm",
+            "Both arms",
+            "Neck",
+            "Jaw",
+            "Back",
+            "Shoulder",
+            "No radiation"
+        ],
+        help="Select where the pain radiates to (if anywhere)",
+        key="pain_radiation"
+    )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        pain_timing = st.radio(
+            "Is the pain constant or intermittent?",
+            ["Constant", "Intermittent (comes and goes)"],
+            help="Does the pain stay all the time or come and go?",
+            key="pain_timing"
+        )
+
+    with col2:
+        # Default set through session state so a restored draft can override it
+        st.session_state.setdefault("pain_severity", 5)
+        pain_severity = st.slider(
+            "Pain Severity",
+            min_value=0,
+            max_value=10,
+            help="0 = No pain | 10 = Worst pain of your life",
+            key="pain_severity"
+        )
+        st.caption(f"You selected: {pain_severity}/10")
+
+    pain_exacerbating = st.text_area(
+        "What makes the pain worse? (If anything)",
+        placeholder="e.g., Movement, breathing deeply, physical activity, lying down, etc.",
+        height=80,
+        help="Describe what makes your pain worse",
+        key="pain_exacerbating"
+    )
+
+    pain_relieving = st.text_area(
+        "What makes the pain better? (If anything)",
+        placeholder="e.g., Rest, medication, position changes, heat/cold, etc.",
+        height=80,
+        help="Describe what makes your pain better",
+        key="pain_relieving"
+    )
+
+    return {
+        "pain_start_date": pain_start_date,
+        "pain_start_time": pain_start_time,
+        "pain_site": pain_site,
+        "pain_onset": pain_onset,
+        "pain_character": pain_character,
+        "pain_radiation": pain_radiation,
+        "pain_timing": pain_timing,
+        "pain_severity": pain_severity,
+        "pain_exacerbating": pain_exacerbating,
+        "pain_relieving": pain_relieving,
+    }
+
+
+def render_section(values):
+    """Render the chest pain details as HTML"""
+    pain_start_date = values.get("pain_start_date")
+    pain_start_time = values.get("pain_start_time")
+    pain_site = values.get("pain_site")
+    pain_character = values.get("pain_character")
+    pain_radiation = values.get("pain_radiation")
+
+    return SECTION_TEMPLATE.substitute(
+        pain_start=f"{pain_start_date if pain_start_date else 'Not specified'} {f'at {pain_start_time}' if pain_start_time else ''}",
+        pain_site=', '.join(pain_site) if pain_site else 'Not specified',
+        pain_onset=values.get("pain_onset") or 'Not specified',
+        pain_character=', '.join(pain_character) if pain_character else 'Not specified',
+        pain_radiation=', '.join(pain_radiation) if pain_radiation else 'No radiation',
+        pain_timing=values.get("pain_timing") or 'Not specified',
+        pain_severity=values.get("pain_severity"),
+        pain_exacerbating=values.get("pain_exacerbating") or 'None reported',
+        pain_relieving=values.get("pain_relieving") or 'None reported',
+    )
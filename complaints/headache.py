@@ -0,0 +1,153 @@
+"""Headache: detailed history of presenting complaint"""
+from string import Template
+
+from validation import int_range
+
+NAME = "Headache"
+
+FIELDS = (
+    "headache_onset", "headache_site", "headache_character", "headache_severity",
+    "headache_red_flags", "headache_previous", "headache_relieving",
+)
+
+RULES = (
+    int_range("headache_severity", 0, 10, "Headache severity must be between 0 and 10"),
+)
+
+RED_FLAGS = [
+    "Worst headache of my life",
+    "Stiff neck",
+    "Fever",
+    "Changes in vision",
+    "Weakness or numbness",
+    "Confusion",
+    "Worse on coughing or straining",
+    "Headache after a head injury",
+]
+
+SECTION_TEMPLATE = Template("""
+        <div class="section">
+            <h2>Additional Headache Details</h2>
+            <div class="field">
+                <span class="label">Onset:</span>
+                <span class="value">$headache_onset</span>
+            </div>
+            <div class="field">
+                <span class="label">Site:</span>
+                <span class="value">$headache_site</span>
+            </div>
+            <div class="field">
+                <span class="label">Character:</span>
+                <span class="value">$headache_character</span>
+            </div>
+            <div class="field">
+                <span class="label">Severity (0-10):</span>
+                <span class="value">$headache_severity/10</span>
+            </div>
+            <div class="field">
+                <span class="label">Associated Features:</span>
+                <span class="value">$headache_red_flags</span>
+            </div>
+            <div class="field">
+                <span class="label">Similar Headaches Before:</span>
+                <span class="value">$headache_previous</span>
+            </div>
+            <div class="field">
+                <span class="label">Relieving Factors:</span>
+                <span class="value">$headache_relieving</span>
+            </div>
+        </div>
+        """)
+
+
+def render_widgets():
+    """Draw the headache questions and return their values"""
+    import streamlit as st
+
+    st.markdown("<div class='section-header'><h2>🤕 History of Headache</h2></div>", unsafe_allow_html=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        headache_onset = st.radio(
+            "How did the headache start?",
+            ["Sudden (within seconds to minutes)", "Gradual"],
+            help="Did it reach full strength almost immediately or build up?",
+            key="headache_onset"
+        )
+
+    with col2:
+        headache_site = st.multiselect(
+            "Where is the headache? (Select all that apply)",
+            ["Forehead", "One side", "Both sides", "Back of head", "Behind the eyes", "Whole head"],
+            help="Select the location(s) of your headache",
+            key="headache_site"
+        )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        headache_character = st.multiselect(
+            "What does the headache feel like?",
+            ["Throbbing/Pounding", "Tight band", "Pressure", "Stabbing", "Dull/Aching", "Not sure"],
+            help="Describe the character of your headache",
+            key="headache_character"
+        )
+
+    with col2:
+        # Default set through session state so a restored draft can override it
+        st.session_state.setdefault("headache_severity", 5)
+        headache_severity = st.slider(
+            "Headache Severity",
+            min_value=0,
+            max_value=10,
+            help="0 = No pain | 10 = Worst pain of your life",
+            key="headache_severity"
+        )
+
+    headache_red_flags = st.multiselect(
+        "Have you had any of the following with the headache?",
+        RED_FLAGS,
+        help="Select any that apply",
+        key="headache_red_flags"
+    )
+
+    headache_previous = st.radio(
+        "Have you had headaches like this before?",
+        ["No", "Yes"],
+        horizontal=True,
+        key="headache_previous"
+    )
+
+    headache_relieving = st.text_area(
+        "What makes the headache better? (If anything)",
+        placeholder="e.g., Painkillers, sleep, a dark room, etc.",
+        height=80,
+        help="Describe what makes your headache better",
+        key="headache_relieving"
+    )
+
+    return {
+        "headache_onset": headache_onset,
+        "headache_site": headache_site,
+        "headache_character": headache_character,
+        "headache_severity": headache_severity,
+        "headache_red_flags": headache_red_flags,
+        "headache_previous": headache_previous,
+        "headache_relieving": headache_relieving,
+    }
+
+
+def render_section(values):
+    """Render the headache details as HTML"""
+    headache_site = values.get("headache_site")
+    headache_character = values.get("headache_character")
+    headache_red_flags = values.get("headache_red_flags")
+
+    return SECTION_TEMPLATE.substitute(
+        headache_onset=values.get("headache_onset") or 'Not specified',
+        headache_site=', '.join(headache_site) if headache_site else 'Not specified',
+        headache_character=', '.join(headache_character) if headache_character else 'Not specified',
+        headache_severity=values.get("headache_severity"),
+        headache_red_flags=', '.join(headache_red_flags) if headache_red_flags else 'None reported',
+        headache_previous=values.get("headache_previous") or 'Not specified',
+        headache_relieving=values.get("headache_relieving") or 'None reported',
+    )
@@ -0,0 +1,41 @@
+"""Other complaints: free-text description"""
+from string import Template
+
+NAME = "Other"
+
+FIELDS = ("other_complaint_detail",)
+
+RULES = ()
+
+SECTION_TEMPLATE = Template("""
+        <div class="section">
+            <h2>Additional Details</h2>
+            <div class="field">
+                <span class="value">$other_complaint_detail</span>
+            </div>
+        </div>
+        """)
+
+
+def render_widgets():
+    """Draw the free-text complaint question and return its value"""
+    import streamlit as st
+
+    st.markdown("<div class='section-header'><h2>📝 History of Complaint</h2></div>", unsafe_allow_html=True)
+
+    other_complaint_detail = st.text_area(
+        "Please describe your complaint in detail:",
+        placeholder="Describe when it started, how it developed, and any relevant details...",
+        height=150,
+        help="Provide as much detail as possible about your symptoms",
+        key="other_complaint_detail"
+    )
+
+    return {"other_complaint_detail": other_complaint_detail}
+
+
+def render_section(values):
+    """Render the free-text complaint as HTML"""
+    return SECTION_TEMPLATE.substitute(
+        other_complaint_detail=values.get("other_complaint_detail") or 'No additional details provided',
+    )
@@ -0,0 +1,142 @@
+"""Shortness of breath: detailed history of presenting complaint"""
+from string import Template
+
+from validation import int_range
+
+NAME = "Shortness of Breath"
+
+FIELDS = (
+    "sob_onset", "sob_exertion", "sob_orthopnoea_pillows", "sob_wheeze",
+    "sob_chest_pain", "sob_sputum", "sob_exacerbating", "sob_relieving",
+)
+
+RULES = (
+    int_range("sob_orthopnoea_pillows", 0, 10, "Number of pillows must be between 0 and 10"),
+)
+
+SECTION_TEMPLATE = Template("""
+        <div class="section">
+            <h2>Additional Shortness of Breath Details</h2>
+            <div class="field">
+                <span class="label">Onset:</span>
+                <span class="value">$sob_onset</span>
+            </div>
+            <div class="field">
+                <span class="label">Breathless With:</span>
+                <span class="value">$sob_exertion</span>
+            </div>
+            <div class="field">
+                <span class="label">Pillows Needed to Sleep:</span>
+                <span class="value">$sob_orthopnoea_pillows</span>
+            </div>
+            <div class="field">
+                <span class="label">Wheeze:</span>
+                <span class="value">$sob_wheeze</span>
+            </div>
+            <div class="field">
+                <span class="label">Chest Pain With Breathlessness:</span>
+                <span class="value">$sob_chest_pain</span>
+            </div>
+            <div class="field">
+                <span class="label">Sputum:</span>
+                <span class="value">$sob_sputum</span>
+            </div>
+            <div class="field">
+                <span class="label">Exacerbating Factors:</span>
+                <span class="value">$sob_exacerbating</span>
+            </div>
+            <div class="field">
+                <span class="label">Relieving Factors:</span>
+                <span class="value">$sob_relieving</span>
+            </div>
+        </div>
+        """)
+
+
+def render_widgets():
+    """Draw the shortness of breath questions and return their values"""
+    import streamlit as st
+
+    st.markdown("<div class='section-header'><h2>🫁 History of Shortness of Breath</h2></div>", unsafe_allow_html=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        sob_onset = st.radio(
+            "How did the breathlessness start?",
+            ["Sudden", "Gradual"],
+            help="Did it come on suddenly or gradually?",
+            key="sob_onset"
+        )
+
+    with col2:
+        sob_exertion = st.radio(
+            "When are you breathless?",
+            ["At rest", "Walking on the flat", "Climbing stairs or hills", "Only with strenuous exercise"],
+            help="Choose the lightest activity that makes you breathless",
+            key="sob_exertion"
+        )
+
+    sob_orthopnoea_pillows = st.number_input(
+        "How many pillows do you need to sleep comfortably?",
+        min_value=0,
+        max_value=10,
+        step=1,
+        help="Needing more pillows than usual can be important",
+        key="sob_orthopnoea_pillows"
+    )
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        sob_wheeze = st.checkbox("Wheezing", key="sob_wheeze")
+    with col2:
+        sob_chest_pain = st.checkbox("Chest pain when breathless", key="sob_chest_pain")
+    with col3:
+        sob_sputum = st.selectbox(
+            "Are you coughing anything up?",
+            ["No", "Clear/white", "Yellow/green", "Blood-stained"],
+            help="Describe any phlegm you are coughing up",
+            key="sob_sputum"
+        )
+
+    sob_exacerbating = st.text_area(
+        "What makes the breathlessness worse? (If anything)",
+        placeholder="e.g., Lying flat, cold air, dust, exercise, etc.",
+        height=80,
+        help="Describe what makes your breathing worse",
+        key="sob_exacerbating"
+    )
+
+    sob_relieving = st.text_area(
+        "What makes the breathlessness better? (If anything)",
+        placeholder="e.g., Inhaler, sitting up, rest, etc.",
+        height=80,
+        help="Describe what makes your breathing better",
+        key="sob_relieving"
+    )
+
+    return {
+        "sob_onset": sob_onset,
+        "sob_exertion": sob_exertion,
+        "sob_orthopnoea_pillows": sob_orthopnoea_pillows,
+        "sob_wheeze": sob_wheeze,
+        "sob_chest_pain": sob_chest_pain,
+        "sob_sputum": sob_sputum,
+        "sob_exacerbating": sob_exacerbating,
+        "sob_relieving": sob_relieving,
+    }
+
+
+def render_section(values):
+    """Render the shortness of breath details as HTML"""
+    pillows = values.get("sob_orthopnoea_pillows")
+
+    return SECTION_TEMPLATE.substitute(
+        sob_onset=values.get("sob_onset") or 'Not specified',
+        sob_exertion=values.get("sob_exertion") or 'Not specified',
+        sob_orthopnoea_pillows=pillows if pillows is not None else 'Not specified',
+        sob_wheeze='Yes' if values.get("sob_wheeze") else 'No',
+        sob_chest_pain='Yes' if values.get("sob_chest_pain") else 'No',
+        sob_sputum=values.get("sob_sputum") or 'Not specified',
+        sob_exacerbating=values.get("sob_exacerbating") or 'None reported',
+        sob_relieving=values.get("sob_relieving") or 'None reported',
+    )
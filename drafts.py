@@ -0,0 +1,224 @@
+"""Crash-safe draft storage for partially completed forms.
+
+Drafts live in a local SQLite database, keyed by a resumable session token,
+with one row per form field. Each session checkpoints through a DraftSession,
+which compares the current widget values against its last checkpoint and
+saves only the fields that changed, at most once per debounce interval.
+Changes made within the interval are held by the store and written by its
+background thread once the interval is up, which also removes drafts that
+have not been updated within the expiry period.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import date, datetime, time as dt_time
+
+DEFAULT_DRAFT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".drafts.sqlite3")
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_DEBOUNCE_SECONDS = 2.0
+DEFAULT_SWEEP_INTERVAL_SECONDS = 5 * 60
+
+_MISSING = object()
+
+
+def new_token():
+    """Create a new resumable draft token"""
+    return uuid.uuid4().hex
+
+
+def is_valid_token(token):
+    """Check that a token looks like one created by new_token()"""
+    return isinstance(token, str) and len(token) == 32 and all(c in "0123456789abcdef" for c in token)
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return json.dumps({"__datetime__": value.isoformat()})
+    if isinstance(value, date):
+        return json.dumps({"__date__": value.isoformat()})
+    if isinstance(value, dt_time):
+        return json.dumps({"__time__": value.isoformat()})
+    return json.dumps(value)
+
+
+def _decode(text):
+    value = json.loads(text)
+    if isinstance(value, dict) and len(value) == 1:
+        if "__datetime__" in value:
+            return datetime.fromisoformat(value["__datetime__"])
+        if "__date__" in value:
+            return date.fromisoformat(value["__date__"])
+        if "__time__" in value:
+            return dt_time.fromisoformat(value["__time__"])
+    return value
+
+
+class DraftStore:
+    """SQLite-backed store of draft form fields, shared by all sessions"""
+
+    def __init__(self, path=DEFAULT_DRAFT_DB_PATH, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS drafts (token TEXT PRIMARY KEY, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS drafts_updated_at ON drafts (updated_at)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS draft_fields ("
+            "token TEXT NOT NULL, field TEXT NOT NULL, value TEXT NOT NULL, "
+            "PRIMARY KEY (token, field))"
+        )
+        self._pending = {}
+        self._sweeper = None
+        self._stop = threading.Event()
+
+    def load(self, token):
+        """Return the saved fields of a draft as a dict (empty if none), including deferred changes"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT field, value FROM draft_fields WHERE token = ?", (token,)
+            ).fetchall()
+            pending = dict(self._pending.get(token, {}))
+        values = {field: _decode(value) for field, value in rows}
+        values.update(pending)
+        return values
+
+    def save(self, token, changes):
+        """Write changed fields of a draft, and any deferred ones, in a single transaction"""
+        with self._lock:
+            merged = self._pending.pop(token, {})
+            merged.update(changes)
+            self._write({token: merged})
+
+    def defer(self, token, changes):
+        """Hold changed fields of a draft until the next flush"""
+        with self._lock:
+            self._pending.setdefault(token, {}).update(changes)
+
+    def flush(self):
+        """Write all deferred changes in a single transaction and return how many drafts were written"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if pending:
+                try:
+                    self._write(pending)
+                except sqlite3.Error:
+                    self._pending = pending  # Keep the changes for the next flush
+                    raise
+        return len(pending)
+
+    def delete(self, token):
+        """Remove a draft, e.g. once the form has been submitted"""
+        with self._lock:
+            self._pending.pop(token, None)
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.execute("DELETE FROM draft_fields WHERE token = ?", (token,))
+                self._conn.execute("DELETE FROM drafts WHERE token = ?", (token,))
+
+    def sweep(self, now=None):
+        """Remove drafts older than the expiry period and return how many were removed"""
+        cutoff = (now if now is not None else time.time()) - self.ttl_seconds
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.execute(
+                    "DELETE FROM draft_fields WHERE token IN (SELECT token FROM drafts WHERE updated_at < ?)",
+                    (cutoff,)
+                )
+                return self._conn.execute("DELETE FROM drafts WHERE updated_at < ?", (cutoff,)).rowcount
+
+    def start_sweeper(self, interval_seconds=DEFAULT_SWEEP_INTERVAL_SECONDS,
+                      flush_interval_seconds=DEFAULT_DEBOUNCE_SECONDS):
+        """Start the background thread that writes deferred changes and removes expired drafts"""
+        if self._sweeper is not None:
+            return
+
+        def run():
+            next_sweep = time.monotonic() + interval_seconds
+            while not self._stop.wait(flush_interval_seconds):
+                try:
+                    self.flush()
+                    if time.monotonic() >= next_sweep:
+                        self.sweep()
+                        next_sweep = time.monotonic() + interval_seconds
+                except sqlite3.Error:
+                    pass  # Try again on the next interval
+
+        self._sweeper = threading.Thread(target=run, name="draft-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def close(self):
+        """Stop the sweeper, write deferred changes and close the database"""
+        self._stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join()
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    # Callers hold self._lock
+    def _write(self, drafts):
+        now = time.time()
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO drafts (token, updated_at) VALUES (?, ?)",
+                [(token, now) for token in drafts]
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO draft_fields (token, field, value) VALUES (?, ?, ?)",
+                [(token, field, _encode(value)) for token, changes in drafts.items() for field, value in changes.items()]
+            )
+
+
+class DraftSession:
+    """Debounced, incremental checkpointing of one session's draft"""
+
+    def __init__(self, store, token, debounce_seconds=DEFAULT_DEBOUNCE_SECONDS):
+        self.store = store
+        self.token = token
+        self.debounce_seconds = debounce_seconds
+        self._saved = {}
+        self._last_write = 0.0
+
+    def restore(self):
+        """Load the saved draft and remember it as the last checkpoint"""
+        values = self.store.load(self.token)
+        self._saved = dict(values)
+        return values
+
+    def checkpoint(self, values, now=None):
+        """Save fields that changed since the last checkpoint.
+
+        Returns the number of fields changed. Within the debounce interval of
+        the previous write the changes are deferred to the store, which writes
+        them on its next flush.
+        """
+        changes = {
+            field: list(value) if isinstance(value, list) else value
+            for field, value in values.items()
+            if self._saved.get(field, _MISSING) != value
+        }
+        if not changes:
+            return 0
+
+        now = now if now is not None else time.monotonic()
+        if now - self._last_write < self.debounce_seconds:
+            self.store.defer(self.token, changes)
+        else:
+            self.store.save(self.token, changes)
+            self._last_write = now
+        self._saved.update(changes)
+        return len(changes)
+
+    def discard(self):
+        """Delete the draft and forget the last checkpoint"""
+        self.store.delete(self.token)
+        self._saved = {}
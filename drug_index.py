@@ -0,0 +1,91 @@
+"""Prefix index over a local drug-name dictionary.
+
+The index is a pair of parallel sorted lists (case-folded keys and display
+names) searched with bisect, so a lookup costs O(log n + k) for k results.
+It is built once per process by the app and shared across all sessions.
+
+Run this module directly to report the index size and lookup latency for a
+dictionary file:
+
+    python drug_index.py data/drug_names.txt
+"""
+import bisect
+import os
+import sys
+import time
+
+DEFAULT_DRUG_NAMES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "drug_names.txt")
+
+
+def normalize(text):
+    """Normalize a drug name or typed prefix for matching"""
+    return " ".join(text.split()).casefold()
+
+
+class DrugIndex:
+    """Sorted-array prefix index of drug names"""
+
+    def __init__(self, names):
+        entries = {}
+        for name in names:
+            name = " ".join(name.split())
+            if name:
+                entries.setdefault(normalize(name), name)
+
+        ordered = sorted(entries.items())
+        self._keys = [key for key, _ in ordered]
+        # Share the key object when the display name is already normalized
+        self._names = [key if key == name else name for key, name in ordered]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def complete(self, prefix, limit=10):
+        """Return up to `limit` drug names starting with `prefix`"""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        keys = self._keys
+        start = bisect.bisect_left(keys, prefix)
+        # Every key with this prefix sorts before prefix + the highest code point
+        end = bisect.bisect_left(keys, prefix + "\U0010ffff", start, min(len(keys), start + limit))
+        return self._names[start:end]
+
+    def memory_bytes(self):
+        """Approximate memory footprint of the index in bytes"""
+        seen = set()
+        total = sys.getsizeof(self._keys) + sys.getsizeof(self._names)
+        for value in self._keys + self._names:
+            if id(value) not in seen:
+                seen.add(id(value))
+                total += sys.getsizeof(value)
+        return total
+
+
+def load_drug_index(path=DEFAULT_DRUG_NAMES_FILE):
+    """Build a DrugIndex from a dictionary file with one name per line"""
+    with open(path, encoding="utf-8") as f:
+        return DrugIndex(line for line in f if not line.startswith("#"))
+
+
+def _report(path, lookups=10000):
+    started = time.perf_counter()
+    index = load_drug_index(path)
+    build_seconds = time.perf_counter() - started
+
+    prefixes = [key[:length] for key in index._keys[::max(1, len(index) // 100)] for length in (1, 2, 3, 5)]
+    started = time.perf_counter()
+    for i in range(lookups):
+        index.complete(prefixes[i % len(prefixes)])
+    lookup_seconds = (time.perf_counter() - started) / lookups
+
+    print(f"Dictionary:   {path}")
+    print(f"Names:        {len(index)}")
+    print(f"Build time:   {build_seconds * 1000:.1f} ms")
+    print(f"Memory:       {index.memory_bytes() / 1024:.1f} KiB")
+    print(f"Lookup (avg): {lookup_seconds * 1_000_000:.1f} µs")
+
+
+if __name__ == "__main__":
+    _report(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DRUG_NAMES_FILE)
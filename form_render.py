@@ -0,0 +1,267 @@
+"""Render a completed patient form as the HTML sent by email.
+
+Kept free of Streamlit so it can be used outside the app, e.g. by the
+synthetic data generator and benchmarks.
+"""
+from datetime import datetime
+
+from complaints import load_complaint
+
+
+def prepare_form_data(patient_name, patient_dob, presenting_complaint,
+                     hpc_when_started, hpc_progression, hpc_severity, hpc_triggers, hpc_relieving, hpc_associated,
+                     complaint_details,
+                     fever, cough_cold, unwell_contacts, sob, calf_pain, recent_surgery,
+                     travel_history, haemoptysis, malignancy_history, prev_vte, orthopnea,
+                     abdominal_pain, vomiting, loss_consciousness, dizziness,
+                     pmh, drug_history, drug_allergies, family_heart_attack, family_stroke,
+                     family_history_detail, smoking_status, alcohol_use, recreational_drugs,
+                     recreational_drugs_detail, additional_info):
+    """Prepare form data as formatted HTML"""
+    
+    # Prepare boolean values as Yes/No strings
+    fever_str = 'Yes' if fever else 'No'
+    cough_cold_str = 'Yes' if cough_cold else 'No'
+    unwell_contacts_str = 'Yes' if unwell_contacts else 'No'
+    sob_str = 'Yes' if sob else 'No'
+    calf_pain_str = 'Yes' if calf_pain else 'No'
+    recent_surgery_str = 'Yes' if recent_surgery else 'No'
+    travel_history_str = 'Yes' if travel_history else 'No'
+    haemoptysis_str = 'Yes' if haemoptysis else 'No'
+    malignancy_history_str = 'Yes' if malignancy_history else 'No'
+    prev_vte_str = 'Yes' if prev_vte else 'No'
+    orthopnea_str = 'Yes' if orthopnea else 'No'
+    abdominal_pain_str = 'Yes' if abdominal_pain else 'No'
+    vomiting_str = 'Yes' if vomiting else 'No'
+    loss_consciousness_str = 'Yes' if loss_consciousness else 'No'
+    dizziness_str = 'Yes' if dizziness else 'No'
+    family_heart_attack_str = 'Yes' if family_heart_attack else 'No'
+    family_stroke_str = 'Yes' if family_stroke else 'No'
+    
+    # Prepare text fields with defaults
+    pmh_str = pmh if pmh else 'None reported'
+    drug_history_str = drug_history if drug_history else 'None reported'
+    family_history_detail_str = family_history_detail if family_history_detail else 'None reported'
+    additional_info_str = additional_info if additional_info else 'None provided'
+    
+    # Build general HPC section
+    general_hpc_section = f"""
+    <div class="section">
+        <h2>History of Your Complaint</h2>
+        <div class="field">
+            <span class="label">When did it start?</span>
+            <span class="value">{hpc_when_started if hpc_when_started else 'Not specified'}</span>
+        </div>
+        <div class="field">
+            <span class="label">How has it progressed?</span>
+            <span class="value">{hpc_progression if hpc_progression else 'Not specified'}</span>
+        </div>
+        <div class="field">
+            <span class="label">Severity:</span>
+            <span class="value">{hpc_severity if hpc_severity else 'Not specified'}</span>
+        </div>
+        <div class="field">
+            <span class="label">What makes it worse?</span>
+            <span class="value">{hpc_triggers if hpc_triggers else 'Not specified'}</span>
+        </div>
+        <div class="field">
+            <span class="label">What makes it better?</span>
+            <span class="value">{hpc_relieving if hpc_relieving else 'Not specified'}</span>
+        </div>
+        <div class="field">
+            <span class="label">Associated symptoms?</span>
+            <span class="value">{hpc_associated if hpc_associated else 'None reported'}</span>
+        </div>
+    </div>
+    """
+    
+    # Add the selected complaint module's section
+    complaint = load_complaint(presenting_complaint)
+    hpc_section = general_hpc_section + (complaint.render_section(complaint_details) if complaint else "")
+    
+    # Build recreational drugs detail section
+    recreational_drugs_detail_section = ""
+    if recreational_drugs == "Yes" and recreational_drugs_detail:
+        recreational_drugs_detail_section = f"""
+            <div class="field">
+                <span class="label">Recreational Drug Details:</span>
+                <span class="value">{recreational_drugs_detail}</span>
+            </div>
+        """
+    
+    # Build the complete HTML using f-string
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    html_content = f"""
+    <html>
+    <head>
+        <style>
+            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+            .section {{ margin: 20px 0; padding: 15px; border-left: 4px solid #1f77b4; background-color: #f9f9f9; }}
+            .section h2 {{ color: #1f77b4; margin-top: 0; }}
+            .field {{ margin: 10px 0; }}
+            .label {{ font-weight: bold; color: #1f77b4; }}
+            .value {{ margin-left: 10px; }}
+            hr {{ border: none; border-top: 2px solid #1f77b4; margin: 30px 0; }}
+        </style>
+    </head>
+    <body>
+        <h1>Patient Medical History Form</h1>
+        <p>Submitted: {timestamp}</p>
+        <hr>
+        
+        <div class="section">
+            <h2>Basic Information</h2>
+            <div class="field">
+                <span class="label">Name:</span>
+                <span class="value">{patient_name}</span>
+            </div>
+            <div class="field">
+                <span class="label">Date of Birth:</span>
+                <span class="value">{patient_dob}</span>
+            </div>
+        </div>
+        
+        <div class="section">
+            <h2>Chief Complaint</h2>
+            <div class="field">
+                <span class="label">Presenting Complaint:</span>
+                <span class="value">{presenting_complaint}</span>
+            </div>
+        </div>
+        
+        {hpc_section}
+        
+        <div class="section">
+            <h2>Systems Review</h2>
+            <div class="field">
+                <span class="label">Fever:</span>
+                <span class="value">{fever_str}</span>
+            </div>
+            <div class="field">
+                <span class="label">Cough/Cold Symptoms:</span>
+                <span class="value">{cough_cold_str}</span>
+            </div>
+            <div class="field">
+                <span class="label">Unwell Contacts:</span>
+                <span class="value">{unwell_contacts_str}</span>
+            </div>
+            <div class="field">
+                <span class="label">Shortness of Breath:</span>
+                <span class="value">{sob_str}</span>
+            </div>
+            <div class="field">
+                <span class="label">Calf Pain:</span>
+                <span class="value">{calf_pain_str}</span>
+            </div>
+            <div class="field">
+                <span class="label">Recent Surgery:</span>
+                <span class="value">{recent_surgery_str}</span>
+            </div>
+            <div class="field">
+                <span class="label">Recent Travel:</span>
+                <span class="value">{travel_history_str}</span>
+            </div>
+            <div class="field">
+                <span class="label">Haemoptysis (Coughing up blood):</span>
+                <span class="value">{haemoptysis_str}</span>
+            </div>
+            <div class="field">
+                <span class="label">History of Cancer:</span>
+                <span class="value">{malignancy_history_str}</span>
+            </div>
+            <div class="field">
+                <span class="label">Previous Blood Clot (DVT/PE):</span>
+                <span class="value">{prev_vte_str}</span>
+            </div>
+            <div class="field">
+                <span class="label">Difficulty Breathing When Lying Flat:</span>
+                <span class="value">{orthopnea_str}</span>
+            </div>
+            <div class="field">
+                <span class="label">Abdominal Pain:</span>
+                <span class="value">{abdominal_pain_str}</span>
+            </div>
+            <div class="field">
+                <span class="label">Vomiting:</span>
+                <span class="value">{vomiting_str}</span>
+            </div>
+            <div class="field">
+                <span class="label">Loss of Consciousness:</span>
+                <span class="value">{loss_consciousness_str}</span>
+            </div>
+            <div class="field">
+                <span class="label">Dizziness:</span>
+                <span class="value">{dizziness_str}</span>
+            </div>
+        </div>
+        
+        <div class="section">
+            <h2>Past Medical History</h2>
+            <div class="field">
+                <span class="value">{pmh_str}</span>
+            </div>
+        </div>
+        
+        <div class="section">
+            <h2>Current Medications</h2>
+            <div class="field">
+                <span class="value">{drug_history_str}</span>
+            </div>
+        </div>
+        
+        <div class="section">
+            <h2>Drug Allergies</h2>
+            <div class="field">
+                <span class="value">{drug_allergies}</span>
+            </div>
+        </div>
+        
+        <div class="section">
+            <h2>Family History</h2>
+            <div class="field">
+                <span class="label">Family History of Heart Attack:</span>
+                <span class="value">{family_heart_attack_str}</span>
+            </div>
+            <div class="field">
+                <span class="label">Family History of Stroke:</span>
+                <span class="value">{family_stroke_str}</span>
+            </div>
+            <div class="field">
+                <span class="label">Additional Family History:</span>
+                <span class="value">{family_history_detail_str}</span>
+            </div>
+        </div>
+        
+        <div class="section">
+            <h2>Social History</h2>
+            <div class="field">
+                <span class="label">Smoking Status:</span>
+                <span class="value">{smoking_status}</span>
+            </div>
+            <div class="field">
+                <span class="label">Alcohol Use:</span>
+                <span class="value">{alcohol_use}</span>
+            </div>
+            <div class="field">
+                <span class="label">Recreational Drug Use:</span>
+                <span class="value">{recreational_drugs}</span>
+            </div>
+            {recreational_drugs_detail_section}
+        </div>
+        
+        <div class="section">
+            <h2>Additional Information</h2>
+            <div class="field">
+                <span class="value">{additional_info_str}</span>
+            </div>
+        </div>
+        
+        <hr>
+        <p style="font-size: 12px; color: #666; text-align: center;">
+            This form was generated automatically by the Patient History Information Tool.
+        </p>
+    </body>
+    </html>
+    """
+    
+    return html_content
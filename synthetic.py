@@ -0,0 +1,265 @@
+"""Seeded generator of synthetic form submissions for load testing.
+
+Each record holds every argument of form_render.prepare_form_data, drawn
+from rough real-world distributions: the mix of presenting complaints,
+how often each systems-review box is ticked, long-tailed free-text lengths
+and names from many scripts. The same seed always gives the same records.
+
+Stream records to a JSON-lines file (dates and times as ISO strings):
+
+    python synthetic.py --count 1000000 --seed 42 --output submissions.jsonl
+"""
+import argparse
+import json
+import random
+import sys
+from datetime import date, time, timedelta
+
+from drug_index import DEFAULT_DRUG_NAMES_FILE
+
+# Presenting complaint mix
+COMPLAINT_WEIGHTS = {
+    "Chest Pain": 0.35,
+    "Shortness of Breath": 0.15,
+    "Headache": 0.10,
+    "Abdominal Pain": 0.15,
+    "Other": 0.25,
+}
+
+# Share of patients ticking each systems-review and family-history box
+CHECKBOX_PREVALENCE = {
+    "fever": 0.12,
+    "cough_cold": 0.20,
+    "unwell_contacts": 0.08,
+    "sob": 0.25,
+    "calf_pain": 0.05,
+    "recent_surgery": 0.04,
+    "travel_history": 0.06,
+    "haemoptysis": 0.02,
+    "malignancy_history": 0.07,
+    "prev_vte": 0.04,
+    "orthopnea": 0.06,
+    "abdominal_pain": 0.15,
+    "vomiting": 0.10,
+    "loss_consciousness": 0.03,
+    "dizziness": 0.14,
+    "family_heart_attack": 0.22,
+    "family_stroke": 0.15,
+}
+
+FIRST_NAMES = [
+    "James", "Olivia", "Mohammed", "Amelia", "José", "Zoë", "Łukasz", "Siobhán", "Chloé", "Björn",
+    "Ngozi", "Aoife", "Søren", "Ayşe", "Mária", "Jiří", "Nguyễn Thị", "Priya", "Rhys", "Mei",
+    "Мария", "Александр", "محمد", "فاطمة", "李", "王芳", "さくら", "민준", "Αλέξανδρος", "יעל",
+]
+LAST_NAMES = [
+    "Smith", "Jones", "Patel", "García", "Müller", "O'Brien", "Nowak", "Kowalczyk", "Núñez", "Øvergaard",
+    "Yılmaz", "Nguyễn", "Okonkwo", "MacGregor", "Horváth", "Dvořák", "Ó Súilleabháin", "Singh", "Chen", "Evans",
+    "Иванова", "Петров", "الهاشمي", "عبدالله", "张", "佐藤", "김", "Παπαδόπουλος", "כהן", "Pérez-Reverte",
+]
+
+WORDS = (
+    "pain started suddenly while walking getting worse since yesterday feels tight heavy sharp comes goes "
+    "worse lying flat better rest after paracetamol ibuprofen nausea sweating tired short breath cough "
+    "dizzy legs swollen morning evening night week days months years ago doctor hospital tablets twice daily "
+    "blood pressure diabetes asthma surgery knee hip heart attack mother father brother sister stroke"
+).split()
+
+SMOKING = (["Never smoked", "Current smoker", "Ex-smoker"], [0.55, 0.15, 0.30])
+ALCOHOL = (["None", "Occasional", "Regular", "Prefer not to say"], [0.25, 0.50, 0.18, 0.07])
+RECREATIONAL = (["No", "Yes", "Prefer not to say"], [0.88, 0.07, 0.05])
+
+
+def _load_drug_names(path=DEFAULT_DRUG_NAMES_FILE):
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+class SubmissionGenerator:
+    """Generates synthetic submissions from a seed"""
+
+    def __init__(self, seed=0, today=None):
+        self.rng = random.Random(seed)
+        self.today = today or date(2026, 1, 1)
+        self.drug_names = _load_drug_names()
+        self._complaints = list(COMPLAINT_WEIGHTS)
+        self._complaint_weights = list(COMPLAINT_WEIGHTS.values())
+
+    def __iter__(self):
+        while True:
+            yield self.submission()
+
+    # ========== VALUE HELPERS ==========
+    def _text(self, p_empty, median_words, sigma=1.0, max_words=400):
+        """Free text with a long-tailed (log-normal) length, or '' with probability p_empty"""
+        rng = self.rng
+        if rng.random() < p_empty:
+            return ""
+        words = min(max_words, max(1, int(rng.lognormvariate(0, sigma) * median_words)))
+        return " ".join(rng.choices(WORDS, k=words)).capitalize()
+
+    def _some(self, options, p_none=0.1, max_items=3):
+        rng = self.rng
+        if rng.random() < p_none:
+            return []
+        return rng.sample(options, rng.randint(1, min(max_items, len(options))))
+
+    def _recent_date(self, days=14, p_none=0.2):
+        if self.rng.random() < p_none:
+            return None
+        return self.today - timedelta(days=self.rng.randint(0, days))
+
+    def _severity(self, mean=6):
+        return max(0, min(10, round(self.rng.gauss(mean, 2))))
+
+    def _drugs(self, mean_count):
+        rng = self.rng
+        count = min(12, int(rng.expovariate(1 / mean_count)))
+        doses = ["5mg daily", "10mg once daily", "20mg at night", "100mg daily", "500mg twice daily", "as needed"]
+        return ", ".join(f"{rng.choice(self.drug_names)} {rng.choice(doses)}" for _ in range(count))
+
+    # ========== COMPLAINT DETAILS ==========
+    def _chest_pain(self):
+        rng = self.rng
+        return {
+            "pain_start_date": self._recent_date(),
+            "pain_start_time": time(rng.randint(0, 23), rng.choice([0, 15, 30, 45])) if rng.random() < 0.6 else None,
+            "pain_site": self._some(["Left side of chest", "Right side of chest", "Center of chest",
+                                     "Upper chest", "Lower chest", "Back", "Not sure"]),
+            "pain_onset": rng.choice(["Sudden", "Gradual"]),
+            "pain_character": self._some(["Throbbing/Pounding", "Heavy/Pressure", "Tight/Squeezing",
+                                          "Sharp/Stabbing", "Burning", "Dull/Aching", "Not sure"]),
+            "pain_radiation": self._some(["Left arm", "Right arm", "Both arms", "Neck", "Jaw", "Back",
+                                          "Shoulder", "No radiation"], p_none=0.4),
+            "pain_timing": rng.choice(["Constant", "Intermittent (comes and goes)"]),
+            "pain_severity": self._severity(),
+            "pain_exacerbating": self._text(0.4, 6),
+            "pain_relieving": self._text(0.5, 5),
+        }
+
+    def _shortness_of_breath(self):
+        rng = self.rng
+        return {
+            "sob_onset": rng.choice(["Sudden", "Gradual"]),
+            "sob_exertion": rng.choice(["At rest", "Walking on the flat", "Climbing stairs or hills",
+                                        "Only with strenuous exercise"]),
+            "sob_orthopnoea_pillows": min(10, int(rng.expovariate(1 / 1.8))),
+            "sob_wheeze": rng.random() < 0.35,
+            "sob_chest_pain": rng.random() < 0.2,
+            "sob_sputum": rng.choices(["No", "Clear/white", "Yellow/green", "Blood-stained"], [0.5, 0.25, 0.22, 0.03])[0],
+            "sob_exacerbating": self._text(0.4, 6),
+            "sob_relieving": self._text(0.5, 5),
+        }
+
+    def _headache(self):
+        rng = self.rng
+        return {
+            "headache_onset": rng.choices(["Sudden (within seconds to minutes)", "Gradual"], [0.15, 0.85])[0],
+            "headache_site": self._some(["Forehead", "One side", "Both sides", "Back of head",
+                                         "Behind the eyes", "Whole head"]),
+            "headache_character": self._some(["Throbbing/Pounding", "Tight band", "Pressure", "Stabbing",
+                                              "Dull/Aching", "Not sure"]),
+            "headache_severity": self._severity(),
+            "headache_red_flags": self._some(["Worst headache of my life", "Stiff neck", "Fever",
+                                              "Changes in vision", "Weakness or numbness", "Confusion",
+                                              "Worse on coughing or straining", "Headache after a head injury"],
+                                             p_none=0.75, max_items=2),
+            "headache_previous": rng.choices(["No", "Yes"], [0.4, 0.6])[0],
+            "headache_relieving": self._text(0.4, 5),
+        }
+
+    def _abdominal_pain(self):
+        rng = self.rng
+        return {
+            "abdo_start_date": self._recent_date(),
+            "abdo_site": self._some(["Upper middle", "Upper right", "Upper left", "Around the belly button",
+                                     "Lower right", "Lower left", "Lower middle", "All over"]),
+            "abdo_character": self._some(["Cramping (comes in waves)", "Sharp/Stabbing", "Burning",
+                                          "Dull/Aching", "Not sure"]),
+            "abdo_severity": self._severity(),
+            "abdo_bowels": self._some(["Diarrhoea", "Constipation", "Blood in stool", "Black stool", "No changes"],
+                                      max_items=2),
+            "abdo_last_period": self._recent_date(days=35, p_none=0.6),
+            "abdo_exacerbating": self._text(0.4, 6),
+            "abdo_relieving": self._text(0.5, 5),
+        }
+
+    def _other(self):
+        return {"other_complaint_detail": self._text(0.1, 25, sigma=1.2)}
+
+    # ========== SUBMISSION ==========
+    def submission(self):
+        """Return one submission as keyword arguments for prepare_form_data"""
+        rng = self.rng
+        complaint = rng.choices(self._complaints, self._complaint_weights)[0]
+        details = {
+            "Chest Pain": self._chest_pain,
+            "Shortness of Breath": self._shortness_of_breath,
+            "Headache": self._headache,
+            "Abdominal Pain": self._abdominal_pain,
+            "Other": self._other,
+        }[complaint]()
+
+        age_days = int(max(0.0, min(100.0, rng.gauss(52, 20))) * 365.25)
+        has_allergies = rng.random() < 0.2
+        recreational_drugs = rng.choices(*RECREATIONAL)[0]
+
+        submission = {
+            "patient_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "patient_dob": self.today - timedelta(days=age_days),
+            "presenting_complaint": complaint,
+            "hpc_when_started": self._text(0.1, 3, sigma=0.5),
+            "hpc_progression": self._text(0.2, 8),
+            "hpc_severity": str(max(1, self._severity())) if rng.random() < 0.85 else "",
+            "hpc_triggers": self._text(0.3, 6),
+            "hpc_relieving": self._text(0.3, 6),
+            "hpc_associated": self._text(0.35, 7),
+            "complaint_details": details,
+        }
+        for field, prevalence in CHECKBOX_PREVALENCE.items():
+            submission[field] = rng.random() < prevalence
+        submission.update({
+            "pmh": self._text(0.3, 8, sigma=1.1),
+            "drug_history": self._drugs(2.5),
+            "drug_allergies": (f"{rng.choice(self.drug_names)} ({rng.choice(['rash', 'swelling', 'nausea', 'anaphylaxis'])})"
+                               if has_allergies else "No known drug allergies"),
+            "family_history_detail": self._text(0.6, 8),
+            "smoking_status": rng.choices(*SMOKING)[0],
+            "alcohol_use": rng.choices(*ALCOHOL)[0],
+            "recreational_drugs": recreational_drugs,
+            "recreational_drugs_detail": self._text(0.2, 5) if recreational_drugs == "Yes" else "",
+            "additional_info": self._text(0.7, 15, sigma=1.4),
+        })
+        return submission
+
+
+def _json_default(value):
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def write_jsonl(out, count, seed=0):
+    """Stream `count` submissions to a text file object as JSON lines"""
+    generator = iter(SubmissionGenerator(seed))
+    for _ in range(count):
+        out.write(json.dumps(next(generator), ensure_ascii=False, default=_json_default))
+        out.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic form submissions as JSON lines.")
+    parser.add_argument("--count", type=int, default=1000, help="number of submissions")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--output", help="output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as out:
+            write_jsonl(out, args.count, args.seed)
+    else:
+        write_jsonl(sys.stdout, args.count, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Tests for the audit trail writer, including a failing disk."""
+import errno
+import logging
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import audit  # noqa: E402
+from audit import AuditLog, query  # noqa: E402
+
+
+class FailingFsync:
+    """Stand-in for os.fsync that fails with ENOSPC for the first `failures` calls (or forever)"""
+
+    def __init__(self, failures=None):
+        self.failures = failures
+        self.calls = 0
+        self._fsync = os.fsync
+
+    def __call__(self, fd):
+        self.calls += 1
+        if self.failures is None or self.calls <= self.failures:
+            raise OSError(errno.ENOSPC, "No space left on device")
+        self._fsync(fd)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_events_are_written_and_queryable(tmp_path):
+    log = AuditLog(str(tmp_path), flush_interval=0.05)
+    log.record("submitted", fingerprint="abc")
+    log.record("delivered", fingerprint="abc", recipient="clinic", smtp_code=250)
+    log.close()
+
+    assert [event["phase"] for event in query(str(tmp_path))] == ["submitted", "delivered"]
+    assert [event["smtp_code"] for event in query(str(tmp_path), phase="delivered")] == [250]
+
+
+def test_rotated_segments_are_compressed_and_queryable(tmp_path):
+    log = AuditLog(str(tmp_path), batch_size=1, max_segment_bytes=200)
+    for i in range(10):
+        log.record("submitted", fingerprint=f"{i:032d}")
+    log.close()
+
+    assert any(name.endswith(".jsonl.gz") for name in os.listdir(tmp_path))
+    assert len(list(query(str(tmp_path)))) == 10
+
+
+def test_failed_writes_are_retried_without_duplicates(tmp_path, monkeypatch, caplog):
+    fsync = FailingFsync(failures=3)
+    monkeypatch.setattr(audit.os, "fsync", fsync)
+    log = AuditLog(str(tmp_path), flush_interval=0.01, retry_delay=0.01)
+
+    with caplog.at_level(logging.ERROR, logger="audit"):
+        log.record("submitted", fingerprint="abc")
+        log.record("rendered", fingerprint="abc")
+        assert wait_for(lambda: fsync.calls > 3)
+        log.record("delivered", fingerprint="abc")
+        log.close()
+
+    assert log.write_errors == 3
+    assert log.dropped == 0
+    assert "Could not write" in caplog.text
+    assert [event["phase"] for event in query(str(tmp_path))] == ["submitted", "rendered", "delivered"]
+
+
+def test_writer_survives_failures_and_close_does_not_hang(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(audit.os, "fsync", FailingFsync())
+    log = AuditLog(str(tmp_path), batch_size=2, flush_interval=0.01, max_queue=2, retry_delay=0.01,
+                   max_retry_delay=0.05)
+
+    with caplog.at_level(logging.ERROR, logger="audit"):
+        for _ in range(20):
+            log.record("submitted", fingerprint="abc")
+            time.sleep(0.005)
+        assert wait_for(lambda: log.write_errors >= 3)
+        assert log._writer.is_alive()
+
+        started = time.monotonic()
+        log.close(timeout=0.2)
+        assert time.monotonic() - started < 1.0
+
+    assert log.dropped > 0
+    assert "events dropped so far" in caplog.text
+    assert "did not finish" in caplog.text
+
+
+@pytest.mark.parametrize("failures", [1, 2])
+def test_close_writes_a_batch_that_failed_before(tmp_path, monkeypatch, failures):
+    monkeypatch.setattr(audit.os, "fsync", FailingFsync(failures=failures))
+    log = AuditLog(str(tmp_path), flush_interval=10, retry_delay=0.01)
+    log.record("submitted", fingerprint="abc")
+    log.close()
+
+    assert [event["phase"] for event in query(str(tmp_path))] == ["submitted"]
@@ -0,0 +1,239 @@
+"""Tests for the email circuit breaker, against throwaway local servers."""
+import os
+import smtplib
+import socket
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from circuit_breaker import (  # noqa: E402
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, counts_as_failure, open_smtp, smtp_probe,
+)
+
+SMTP_CONNECT_TIMEOUT = 0.5
+SMTP_READ_TIMEOUT = 1.0
+
+
+class FakeServer:
+    """TCP server on 127.0.0.1 that either never greets or speaks just enough SMTP to greet and quit"""
+
+    def __init__(self, greet):
+        self.greet = greet
+        self.connections = []
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen()
+        self.port = self.sock.getsockname()[1]
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            self.connections.append(conn)
+            if self.greet:
+                threading.Thread(target=self._greet_and_quit, args=(conn,), daemon=True).start()
+
+    def _greet_and_quit(self, conn):
+        try:
+            conn.sendall(b"220 fake.example ESMTP\r\n")
+            with conn.makefile("rb") as f:
+                for line in f:
+                    if line.upper().startswith(b"QUIT"):
+                        conn.sendall(b"221 Bye\r\n")
+                        return
+                    conn.sendall(b"250 OK\r\n")
+        except OSError:
+            pass
+
+    def close(self):
+        self.sock.close()
+        for conn in self.connections:
+            conn.close()
+
+
+@pytest.fixture
+def hanging_server():
+    server = FakeServer(greet=False)
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def greeting_server():
+    server = FakeServer(greet=True)
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def closed_port():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def connect(port):
+    return open_smtp("127.0.0.1", port, SMTP_CONNECT_TIMEOUT, SMTP_READ_TIMEOUT)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+# ========== ERROR CLASSIFICATION ==========
+@pytest.mark.parametrize("error", [
+    ConnectionRefusedError(),
+    ConnectionResetError(),
+    TimeoutError(),
+    socket.timeout(),
+    socket.gaierror(),
+    smtplib.SMTPServerDisconnected("Connection unexpectedly closed"),
+    smtplib.SMTPConnectError(554, b"No service"),
+    smtplib.SMTPResponseException(421, b"Service not available"),
+    smtplib.SMTPSenderRefused(421, b"Service not available", "clinic@example.com"),
+])
+def test_unavailable_server_counts_as_failure(error):
+    assert counts_as_failure(error)
+
+
+@pytest.mark.parametrize("error", [
+    smtplib.SMTPRecipientsRefused({"typo@example.con": (550, b"No such user")}),
+    smtplib.SMTPSenderRefused(553, b"Sender not allowed", "clinic@example.com"),
+    smtplib.SMTPAuthenticationError(535, b"Authentication failed"),
+    smtplib.SMTPNotSupportedError("STARTTLS extension not supported by server."),
+    smtplib.SMTPDataError(554, b"Message rejected"),
+    smtplib.SMTPResponseException(450, b"Mailbox busy"),
+    ValueError("not an SMTP error"),
+])
+def test_errors_from_a_working_server_do_not_count(error):
+    assert not counts_as_failure(error)
+
+
+def test_rejected_recipients_never_open_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=3)
+
+    def send():
+        raise smtplib.SMTPRecipientsRefused({"typo@example.con": (550, b"No such user")})
+
+    for _ in range(5):
+        with pytest.raises(smtplib.SMTPRecipientsRefused):
+            breaker.call(send)
+    assert breaker.state == CLOSED
+    assert breaker.stats()["total_failures"] == 0
+
+
+# ========== AGAINST LOCAL SERVERS ==========
+def test_connect_times_out_when_server_never_greets(hanging_server):
+    started = time.monotonic()
+    with pytest.raises((socket.timeout, TimeoutError, smtplib.SMTPServerDisconnected)) as excinfo:
+        connect(hanging_server.port)
+    assert time.monotonic() - started < SMTP_CONNECT_TIMEOUT + 0.5
+    assert counts_as_failure(excinfo.value)
+
+
+def test_connection_refused_counts_as_failure(closed_port):
+    with pytest.raises(ConnectionRefusedError) as excinfo:
+        connect(closed_port)
+    assert counts_as_failure(excinfo.value)
+
+
+def test_breaker_opens_after_threshold_and_rejects_calls(hanging_server, closed_port):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+
+    with pytest.raises(ConnectionRefusedError):
+        breaker.call(connect, closed_port)
+    with pytest.raises(ConnectionRefusedError):
+        breaker.call(connect, closed_port)
+    assert breaker.state == CLOSED
+    with pytest.raises((socket.timeout, TimeoutError, smtplib.SMTPServerDisconnected)):
+        breaker.call(connect, hanging_server.port)
+    assert breaker.state == OPEN
+
+    assert not breaker.allow()
+    started = time.monotonic()
+    with pytest.raises(CircuitOpenError):
+        breaker.call(connect, hanging_server.port)
+    assert time.monotonic() - started < 0.1
+    assert breaker.stats()["total_rejected"] == 2
+
+
+def test_successful_probe_half_opens_and_trial_closes(greeting_server, closed_port):
+    assert smtp_probe("127.0.0.1", greeting_server.port, SMTP_CONNECT_TIMEOUT)
+    assert not smtp_probe("127.0.0.1", closed_port, SMTP_CONNECT_TIMEOUT)
+
+    breaker = CircuitBreaker(
+        failure_threshold=1,
+        reset_timeout=60,
+        probe=lambda: smtp_probe("127.0.0.1", greeting_server.port, SMTP_CONNECT_TIMEOUT),
+        probe_interval=0.05,
+    )
+    try:
+        with pytest.raises(ConnectionRefusedError):
+            breaker.call(connect, closed_port)
+        assert breaker.state == OPEN
+
+        breaker.start_prober()
+        assert wait_for(lambda: breaker.state == HALF_OPEN)
+
+        # One trial at a time while half-open
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.release()
+
+        def trial():
+            with connect(greeting_server.port) as server:
+                return server.noop()[0]
+
+        assert breaker.call(trial) == 250
+        assert breaker.state == CLOSED
+    finally:
+        breaker.close()
+
+
+def test_failed_trial_reopens(closed_port):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.2)
+    with pytest.raises(ConnectionRefusedError):
+        breaker.call(connect, closed_port)
+    assert breaker.state == OPEN
+    assert wait_for(lambda: breaker.state == HALF_OPEN)
+    with pytest.raises(ConnectionRefusedError):
+        breaker.call(connect, closed_port)
+    assert breaker.stats()["state"] == OPEN
+
+
+def test_state_changes_report_stats(closed_port):
+    changes = []
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60,
+                             on_state_change=lambda old, stats: changes.append((old, stats)))
+    for _ in range(2):
+        with pytest.raises(ConnectionRefusedError):
+            breaker.call(connect, closed_port)
+    breaker.allow()
+
+    assert len(changes) == 1
+    old, stats = changes[0]
+    assert old == CLOSED
+    assert stats["state"] == OPEN
+    assert stats["consecutive_failures"] == 2
+    assert stats["total_failures"] == 2
+    assert breaker.stats()["total_rejected"] == 1
+
+    breaker.record_success()
+    old, stats = changes[-1]
+    assert (old, stats["state"], stats["consecutive_failures"]) == (OPEN, CLOSED, 0)
+    assert stats["opened_seconds_ago"] is not None
@@ -0,0 +1,115 @@
+"""Tests for draft autosave, against a temporary SQLite database."""
+import os
+import sys
+import time
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from drafts import DraftSession, DraftStore, is_valid_token, new_token  # noqa: E402
+
+TOKEN = "a" * 32
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "drafts.sqlite3")
+
+
+@pytest.fixture
+def store(db_path):
+    store = DraftStore(db_path, ttl_seconds=60)
+    yield store
+    store.close()
+
+
+def on_disk(db_path, token=TOKEN):
+    """What a new process would restore, ignoring changes held in memory"""
+    other = DraftStore(db_path)
+    try:
+        return other.load(token)
+    finally:
+        other.close()
+
+
+def test_tokens():
+    assert is_valid_token(new_token())
+    assert not is_valid_token("../../etc/passwd")
+    assert not is_valid_token(None)
+
+
+def test_first_checkpoint_is_written_immediately(store, db_path):
+    session = DraftSession(store, TOKEN, debounce_seconds=2)
+    assert session.checkpoint({"pmh": "x", "patient_dob": date(1980, 5, 17)}, now=100) == 2
+    assert on_disk(db_path) == {"pmh": "x", "patient_dob": date(1980, 5, 17)}
+
+
+def test_only_changed_fields_are_checkpointed(store):
+    session = DraftSession(store, TOKEN, debounce_seconds=2)
+    session.checkpoint({"pmh": "x", "pain_site": ["Back"]}, now=100)
+    assert session.checkpoint({"pmh": "x", "pain_site": ["Back"]}, now=110) == 0
+    assert session.checkpoint({"pmh": "x", "pain_site": ["Back", "Jaw"]}, now=120) == 1
+
+
+def test_changes_within_debounce_are_deferred_not_lost(store, db_path):
+    session = DraftSession(store, TOKEN, debounce_seconds=2)
+    session.checkpoint({"pmh": "x"}, now=100)
+    assert session.checkpoint({"pmh": "xy"}, now=101) == 1
+
+    # Not written yet, but a reconnecting session in this process sees it
+    assert on_disk(db_path) == {"pmh": "x"}
+    assert store.load(TOKEN) == {"pmh": "xy"}
+    assert DraftSession(store, TOKEN).restore() == {"pmh": "xy"}
+
+
+def test_flush_writes_deferred_changes(store, db_path):
+    session = DraftSession(store, TOKEN, debounce_seconds=2)
+    session.checkpoint({"pmh": "x", "additional_info": ""}, now=100)
+    session.checkpoint({"pmh": "xy"}, now=101)
+    session.checkpoint({"additional_info": "z"}, now=101.5)
+
+    assert store.flush() == 1
+    assert on_disk(db_path) == {"pmh": "xy", "additional_info": "z"}
+    assert store.flush() == 0
+
+
+def test_save_includes_deferred_changes(store, db_path):
+    session = DraftSession(store, TOKEN, debounce_seconds=2)
+    session.checkpoint({"pmh": "x", "additional_info": ""}, now=100)
+    session.checkpoint({"pmh": "xy"}, now=101)
+    session.checkpoint({"additional_info": "z"}, now=103)
+    assert on_disk(db_path) == {"pmh": "xy", "additional_info": "z"}
+
+
+def test_close_flushes_deferred_changes(db_path):
+    store = DraftStore(db_path)
+    session = DraftSession(store, TOKEN, debounce_seconds=2)
+    session.checkpoint({"pmh": "x"}, now=100)
+    session.checkpoint({"pmh": "xy"}, now=101)
+    store.close()
+    assert on_disk(db_path) == {"pmh": "xy"}
+
+
+def test_delete_drops_deferred_changes(store, db_path):
+    session = DraftSession(store, TOKEN, debounce_seconds=2)
+    session.checkpoint({"pmh": "x"}, now=100)
+    session.checkpoint({"pmh": "xy"}, now=101)
+    session.discard()
+
+    assert store.load(TOKEN) == {}
+    assert store.flush() == 0
+    assert on_disk(db_path) == {}
+
+
+def test_sweep_removes_expired_drafts(store):
+    store.save(TOKEN, {"pmh": "x"})
+    store.save("b" * 32, {"pmh": "y"})
+    saved_at = time.time()
+
+    assert store.sweep(now=saved_at + 30) == 0
+    assert store.load(TOKEN) == {"pmh": "x"}
+    assert store.sweep(now=saved_at + 120) == 2
+    assert store.load(TOKEN) == {}
+    assert store.load("b" * 32) == {}
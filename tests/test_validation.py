@@ -0,0 +1,154 @@
+"""Tests for declarative form validation and the incremental validator."""
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from complaints import PLACEHOLDER  # noqa: E402
+from validation import IncrementalValidator, compile_rules, validate  # noqa: E402
+
+VALID = {
+    "patient_name": "Alex Smith",
+    "patient_dob": date(1970, 5, 17),
+    "presenting_complaint": "Chest Pain",
+    "hpc_severity": "7/10",
+    "has_allergies": "No",
+    "drug_allergies": "",
+    "receiving_email": "clinic@example.com",
+    "patient_email": "",
+    "pain_start_date": date.today(),
+    "pain_severity": 6,
+}
+
+
+def form(**changes):
+    values = dict(VALID)
+    values.update(changes)
+    return values
+
+
+def test_valid_form_has_no_errors_or_warnings():
+    assert validate(VALID) == {}
+    assert validate(VALID, blocking=False) == {}
+
+
+@pytest.mark.parametrize("changes, field", [
+    ({"patient_name": "  "}, "patient_name"),
+    ({"patient_dob": None}, "patient_dob"),
+    ({"patient_dob": date.today() + timedelta(days=1)}, "patient_dob"),
+    ({"patient_dob": date(1800, 1, 1)}, "patient_dob"),
+    ({"presenting_complaint": PLACEHOLDER}, "presenting_complaint"),
+    ({"receiving_email": "clinic.example.com"}, "receiving_email"),
+    ({"patient_email": "me@"}, "patient_email"),
+    ({"has_allergies": "Yes"}, "drug_allergies"),
+])
+def test_blocking_errors(changes, field):
+    assert field in validate(form(**changes))
+
+
+@pytest.mark.parametrize("complaint", ["Nonexistent", "", None, ["Chest Pain"]])
+def test_unregistered_complaints_are_rejected(complaint):
+    assert "presenting_complaint" in validate(form(presenting_complaint=complaint))
+
+
+def test_unregistered_complaints_share_the_base_rules():
+    assert compile_rules("Nonexistent") is compile_rules("Other nonexistent") is compile_rules(None)
+    assert compile_rules("Chest Pain") is compile_rules("Chest Pain")
+    assert compile_rules("Chest Pain") is not compile_rules(None)
+
+
+# ========== WARNINGS (do not block submission) ==========
+@pytest.mark.parametrize("severity", ["7", "7/10", "10", "6-7", "about 8", "8 out of 10", ""])
+def test_severity_with_a_rating_passes(severity):
+    values = form(hpc_severity=severity)
+    assert validate(values) == {}
+    assert validate(values, blocking=False) == {}
+
+
+@pytest.mark.parametrize("severity", ["moderate", "0", "15", "really bad"])
+def test_severity_without_a_rating_only_warns(severity):
+    values = form(hpc_severity=severity)
+    assert validate(values) == {}
+    assert "hpc_severity" in validate(values, blocking=False)
+
+
+def test_complaint_rules_only_warn():
+    values = form(pain_start_date=date.today() + timedelta(days=3), pain_severity=11)
+    assert validate(values) == {}
+    assert set(validate(values, blocking=False)) == {"pain_start_date", "pain_severity"}
+
+
+# ========== INCREMENTAL VALIDATOR ==========
+def test_first_update_checks_every_field():
+    validator = IncrementalValidator(compile_rules("Chest Pain"))
+    values = form(patient_name="", hpc_severity="moderate")
+    assert validator.update(values) == compile_rules("Chest Pain").fields
+    assert validator.errors == validate(values)
+    assert validator.warnings == validate(values, blocking=False)
+
+
+def test_only_changed_fields_are_reported():
+    validator = IncrementalValidator(compile_rules("Chest Pain"))
+    validator.update(VALID)
+    assert validator.update(form(additional_info="not validated")) == set()
+    assert validator.update(form(receiving_email="x")) == {"receiving_email"}
+    assert validator.update(form(receiving_email="x")) == set()
+
+
+def test_list_values_are_copied():
+    validator = IncrementalValidator(compile_rules("Chest Pain"))
+    sites = ["Back"]
+    validator.update(form(pain_site=sites))
+    sites.append("Jaw")
+    assert validator.update(form(pain_site=sites)) == set()  # pain_site has no rules
+
+
+def test_dependent_rule_is_rechecked_when_its_condition_changes():
+    validator = IncrementalValidator(compile_rules("Chest Pain"))
+    validator.update(VALID)
+    assert validator.errors == {}
+
+    # Only has_allergies changes, but the drug_allergies rule reads it
+    validator.update(form(has_allergies="Yes"))
+    assert "drug_allergies" in validator.errors
+
+    validator.update(form(has_allergies="Yes", drug_allergies="Penicillin (rash)"))
+    assert validator.errors == {}
+
+    validator.update(form(has_allergies="No", drug_allergies=""))
+    assert validator.errors == {}
+
+
+def test_warnings_do_not_block():
+    validator = IncrementalValidator(compile_rules("Chest Pain"))
+    validator.update(form(hpc_severity="moderate"))
+    assert validator.errors == {}
+    assert set(validator.warnings) == {"hpc_severity"}
+
+
+def test_incremental_results_match_full_validation():
+    rng = random.Random(0)
+    choices = {
+        "patient_name": ["", " ", "Alex Smith"],
+        "patient_dob": [None, date(1970, 5, 17), date.today() + timedelta(days=1)],
+        "hpc_severity": ["", "7", "6-7", "moderate"],
+        "has_allergies": ["No", "Yes"],
+        "drug_allergies": ["", "Penicillin (rash)"],
+        "receiving_email": ["", "clinic@example.com", "clinic"],
+        "patient_email": ["", "me@example.com", "me@"],
+        "pain_start_date": [None, date.today(), date.today() + timedelta(days=2)],
+        "pain_severity": [0, 5, 11],
+        "additional_info": ["", "x"],
+    }
+    validator = IncrementalValidator(compile_rules("Chest Pain"))
+    values = dict(VALID)
+    for _ in range(500):
+        for field in rng.sample(list(choices), rng.randint(1, 3)):
+            values[field] = rng.choice(choices[field])
+        validator.update(values)
+        assert validator.errors == validate(values)
+        assert validator.warnings == validate(values, blocking=False)
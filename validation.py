@@ -0,0 +1,209 @@
+"""Declarative validation of the patient form.
+
+Rules are plain data: the field an error is reported on, a check of that
+field's value, and optionally a condition on other fields. Blocking rules
+(required fields, email addresses, date of birth) must pass before the form
+can be sent; the others only warn the patient. compile_rules()
+indexes them by every field they read, once per process, so that an
+IncrementalValidator only re-runs the rules whose inputs changed since the
+previous call. Nothing here depends on Streamlit, so any other ingestion path
+can validate a dict of form values the same way:
+
+    errors = validate(values)  # {field: message}
+    warnings = validate(values, blocking=False)
+
+Dates are datetime.date objects and multi-choice answers are lists, as
+returned by the Streamlit widgets.
+"""
+import re
+from datetime import date
+
+from complaints import REGISTRY, load_complaint
+
+EMAIL_PATTERN = re.compile(r'^[\w\.-]+@[\w\.-]+\.\w+$')
+SEVERITY_PATTERN = re.compile(r'(?<!\d)(10|[1-9])(?!\d)')
+MAX_AGE_YEARS = 120
+
+
+class Rule:
+    """A check of one field, optionally applied only when a condition on other fields holds"""
+
+    __slots__ = ("field", "check", "message", "when", "depends_on", "blocking")
+
+    def __init__(self, field, check, message, when=None, depends_on=(), blocking=True):
+        self.field = field
+        self.check = check
+        self.message = message
+        self.when = when
+        self.depends_on = tuple(depends_on)
+        self.blocking = blocking
+
+    def passes(self, values):
+        """Return True if the rule does not apply or the field's value passes the check"""
+        if self.when is not None and not self.when(values):
+            return True
+        return self.check(values.get(self.field))
+
+
+# ========== RULE BUILDERS ==========
+def _filled(value):
+    if isinstance(value, str):
+        return value.strip() != ""
+    return value is not None and value != []
+
+
+def _registered(complaint):
+    return isinstance(complaint, str) and complaint in REGISTRY
+
+
+def required(field, message):
+    """Field has a non-blank value"""
+    return Rule(field, _filled, message)
+
+
+def required_if(field, other_field, other_value, message):
+    """Field has a non-blank value whenever other_field equals other_value"""
+    return Rule(field, _filled, message,
+                when=lambda values: values.get(other_field) == other_value, depends_on=(other_field,))
+
+
+def email(field, message, optional=False):
+    """Field looks like an email address (or is blank, if optional)"""
+    def check(value):
+        if not value or not value.strip():
+            return optional
+        return EMAIL_PATTERN.match(value.strip()) is not None
+    return Rule(field, check, message)
+
+
+def not_in_future(field, message):
+    """Date, if given, is not after today (warning only)"""
+    return Rule(field, lambda value: value is None or value <= date.today(), message, blocking=False)
+
+
+def plausible_birth_date(field, message):
+    """Date, if given, is not in the future and at most MAX_AGE_YEARS ago"""
+    def check(value):
+        if value is None:
+            return True
+        today = date.today()
+        return date(today.year - MAX_AGE_YEARS, 1, 1) <= value <= today
+    return Rule(field, check, message)
+
+
+def int_range(field, low, high, message):
+    """Number, if given, is between low and high inclusive (warning only)"""
+    return Rule(field, lambda value: value is None or low <= value <= high, message, blocking=False)
+
+
+def severity_text(field, message):
+    """Free-text severity, if given, mentions a 1-10 rating, e.g. "7/10" or "about 6-7" (warning only)"""
+    return Rule(field, lambda value: not value or SEVERITY_PATTERN.search(value) is not None, message,
+                blocking=False)
+
+
+# ========== PATIENT FORM RULES ==========
+FORM_RULES = (
+    required("patient_name", "Full name is required"),
+    required("patient_dob", "Date of birth is required"),
+    plausible_birth_date("patient_dob", "Please check your date of birth"),
+    Rule("presenting_complaint", _registered, "Please select a presenting complaint"),
+    severity_text("hpc_severity", "If you can, please include a rating from 1 to 10 in the severity"),
+    required_if("drug_allergies", "has_allergies", "Yes", "Please list your drug allergies"),
+    email("receiving_email", "Please enter a valid receiving email address"),
+    email("patient_email", "Please enter a valid email address for your copy", optional=True),
+)
+
+
+class CompiledRules:
+    """Rules in order, indexed by each field they read"""
+
+    def __init__(self, rules):
+        self.rules = tuple(rules)
+        self.fields = set()
+        self.by_field = {}
+        for index, rule in enumerate(self.rules):
+            for field in (rule.field,) + rule.depends_on:
+                self.fields.add(field)
+                self.by_field.setdefault(field, []).append(index)
+
+    def validate(self, values, blocking=True):
+        """Check the blocking rules (or the warnings); return {field: message} for the first failing rule of each field"""
+        errors = {}
+        for rule in self.rules:
+            if rule.blocking == blocking and rule.field not in errors and not rule.passes(values):
+                errors[rule.field] = rule.message
+        return errors
+
+
+# The form rules alone, for no complaint or one that is not registered
+_BASE_RULES = CompiledRules(FORM_RULES)
+_compiled = {}
+
+
+def compile_rules(presenting_complaint=None):
+    """Return the compiled rules for the form with the given complaint, compiling them once"""
+    if not _registered(presenting_complaint):
+        return _BASE_RULES
+    compiled = _compiled.get(presenting_complaint)
+    if compiled is None:
+        complaint = load_complaint(presenting_complaint)
+        compiled = CompiledRules(FORM_RULES + tuple(complaint.RULES))
+        _compiled[presenting_complaint] = compiled
+    return compiled
+
+
+def validate(values, blocking=True):
+    """Validate a complete dict of form values, returning errors (or warnings if blocking is False)"""
+    return compile_rules(values.get("presenting_complaint")).validate(values, blocking)
+
+
+_MISSING = object()
+
+
+class IncrementalValidator:
+    """Re-checks only the rules that read fields changed since the previous update"""
+
+    def __init__(self, compiled):
+        self.compiled = compiled
+        self._values = {}
+        self._failing = set()
+
+    def update(self, values):
+        """Re-check the rules affected by changed values; return the set of changed fields"""
+        compiled = self.compiled
+        changed = {
+            field for field in compiled.fields
+            if values.get(field) != self._values.get(field, _MISSING)
+        }
+        if not changed:
+            return changed
+
+        rules = compiled.rules
+        for index in {index for field in changed for index in compiled.by_field[field]}:
+            if rules[index].passes(values):
+                self._failing.discard(index)
+            else:
+                self._failing.add(index)
+        for field in changed:
+            value = values.get(field)
+            self._values[field] = list(value) if isinstance(value, list) else value
+        return changed
+
+    @property
+    def errors(self):
+        """{field: message} for the first failing blocking rule of each field, in rule order"""
+        return self._messages(blocking=True)
+
+    @property
+    def warnings(self):
+        """{field: message} for the first failing warning rule of each field, in rule order"""
+        return self._messages(blocking=False)
+
+    def _messages(self, blocking):
+        messages = {}
+        for index in sorted(self._failing):
+            rule = self.compiled.rules[index]
+            if rule.blocking == blocking:
+                messages.setdefault(rule.field, rule.message)
+        return messages